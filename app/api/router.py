@@ -1,11 +1,14 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 # Import all API routers
 from app.api.auth import router as auth_router
 from app.api.example import router as example_router
 
 # Create a main API router
-api_router = APIRouter()
+# ORJSONResponse serializes responses through orjson's Rust codec instead of
+# the stdlib json module; sub-routers inherit it unless they override
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Include all API routers
 api_router.include_router(auth_router)
@@ -1,8 +1,10 @@
 """Configuration management for the fraud detection system"""
 
 import os
+from functools import lru_cache
 from typing import Optional
-from pydantic import BaseSettings, validator
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -44,16 +46,31 @@ class Settings(BaseSettings):
     GDPR_RETENTION_DAYS: int = 2555  # 7 years as per Irish banking regulations
     AUDIT_LOG_ENABLED: bool = True
     
-    @validator('SECRET_KEY')
+    @field_validator('SECRET_KEY')
+    @classmethod
     def validate_secret_key(cls, v):
         if len(v) < 32:
             raise ValueError('SECRET_KEY must be at least 32 characters long')
         return v
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # frozen=True lets pydantic skip revalidation on attribute access and
+    # makes the cached instance safely shareable across requests
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True, extra="ignore")
 
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings instance on first use and cache it
+
+    Settings() re-reads the environment and .env file and runs validation
+    on every call; caching keeps that cost to a single construction.
+    """
+    return Settings()
+
+
+def __getattr__(name):
+    # Keep `from app.core.config import settings` working without paying
+    # for Settings() construction at import time
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
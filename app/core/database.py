@@ -1,25 +1,57 @@
 """Database configuration and models for fraud detection"""
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Numeric
+from sqlalchemy import create_engine, event, insert, text, Column, Index, BigInteger, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import scoped_session, sessionmaker, Session, relationship
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.sql import func
 from datetime import datetime
-from typing import Generator
+from decimal import Decimal
+from typing import Generator, Optional
+import asyncio
+import contextvars
+import hashlib
 import logging
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Database setup
+# Database setup with an explicit connection pool so concurrent request
+# handlers reuse connections instead of opening/closing one per session
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    connect_args={"check_same_thread": False, "timeout": 30} if "sqlite" in settings.DATABASE_URL else {},
     echo=settings.DEBUG
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if "sqlite" in settings.DATABASE_URL:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Enable WAL mode so readers don't block the writer, and tune caches"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
+# expire_on_commit=False keeps attribute state after commit, so handlers can
+# read back what they just wrote without a fresh SELECT per attribute access
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Request-scoped session registry: each task/request sees its own session
+# instance for the duration of the request instead of opening a new one per call
+_session_context: contextvars.ContextVar = contextvars.ContextVar("db_session_scope")
+ScopedSession = scoped_session(SessionLocal, scopefunc=lambda: _session_context.get(None))
 Base = declarative_base()
 
 
@@ -52,12 +84,17 @@ class Account(Base):
     account_number = Column(String(50), unique=True, index=True, nullable=False)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
     account_type = Column(String(20), nullable=False)  # checking, savings, credit
-    balance = Column(Numeric(15, 2), default=0.00)
+    balance = Column(BigInteger, default=0)  # Integer cents: fixed-width, no Decimal decode
     currency = Column(String(3), default="EUR")
     status = Column(String(20), default="active")  # active, suspended, closed
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
+    @hybrid_property
+    def balance_decimal(self) -> Decimal:
+        """Balance in euro as an exact Decimal"""
+        return Decimal(self.balance) / 100
+    
     # Relationships
     customer = relationship("Customer", back_populates="accounts")
     transactions = relationship("Transaction", back_populates="account")
@@ -69,14 +106,14 @@ class Transaction(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     transaction_id = Column(String(50), unique=True, index=True, nullable=False)
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
-    amount = Column(Numeric(15, 2), nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    amount = Column(BigInteger, nullable=False)  # Integer cents: fixed-width, no Decimal decode
     currency = Column(String(3), default="EUR")
     transaction_type = Column(String(20), nullable=False)  # debit, credit, transfer
     merchant_name = Column(String(100))
-    merchant_category = Column(String(50))
-    location_country = Column(String(2))  # ISO country code
+    merchant_category = Column(String(50), index=True)
+    location_country = Column(String(2), index=True)  # ISO country code
     location_city = Column(String(50))
     device_fingerprint = Column(String(100))
     ip_address = Column(String(45))
@@ -84,13 +121,30 @@ class Transaction(Base):
     
     # Fraud detection fields
     risk_score = Column(Float, default=0.0)
-    is_flagged = Column(Boolean, default=False)
-    fraud_indicators = Column(Text)  # JSON string of detected patterns
+    is_flagged = Column(Boolean, default=False, index=True)
+    fraud_indicators = Column(JSON)  # List of detected patterns (SQLite JSON1)
     
     # Status and timestamps
-    status = Column(String(20), default="pending")  # pending, approved, blocked, investigating
+    status = Column(String(20), default="pending", index=True)  # pending, approved, blocked, investigating
     processed_at = Column(DateTime)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)
+    
+    # Composite indexes matching the dashboard query patterns (filter first, then sort)
+    __table_args__ = (
+        Index("ix_tx_status_risk", "status", "risk_score"),
+        Index("ix_tx_customer_created", "customer_id", "created_at"),
+        Index("ix_tx_account_created", "account_id", "created_at"),
+        # Statistics aggregation: range-scan on created_at with the
+        # aggregated column in the index, avoiding table heap lookups
+        Index("ix_tx_created_flagged", "created_at", "is_flagged"),
+        Index("ix_tx_created_status", "created_at", "status", "amount"),
+        Index("ix_tx_created_risk", "created_at", "risk_score"),
+    )
+    
+    @hybrid_property
+    def amount_decimal(self) -> Decimal:
+        """Amount in euro as an exact Decimal"""
+        return Decimal(self.amount) / 100
     
     # Relationships
     account = relationship("Account", back_populates="transactions")
@@ -104,23 +158,29 @@ class FraudAlert(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     alert_id = Column(String(50), unique=True, index=True, nullable=False)
-    transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=False)
+    transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=False, index=True)
     alert_type = Column(String(50), nullable=False)
     severity = Column(String(20), nullable=False)  # low, medium, high, critical
     risk_score = Column(Float, nullable=False)
     description = Column(Text)
-    fraud_indicators = Column(Text)  # JSON string of specific indicators
+    fraud_indicators = Column(JSON)  # List of specific indicators (SQLite JSON1)
     
     # Investigation fields
-    status = Column(String(20), default="open")  # open, investigating, resolved, false_positive
+    status = Column(String(20), default="open", index=True)  # open, investigating, resolved, false_positive
     assigned_to = Column(String(50))
     investigation_notes = Column(Text)
     resolution = Column(String(20))  # approved, blocked, escalated
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)
     resolved_at = Column(DateTime)
     
+    # Composite indexes for the alert queue (status filter, severity/recency sort)
+    __table_args__ = (
+        Index("ix_alert_status_severity_created", "status", "severity", "created_at"),
+        Index("ix_alert_status_created", "status", "created_at"),
+    )
+    
     # Relationships
     transaction = relationship("Transaction", back_populates="alerts")
 
@@ -133,7 +193,7 @@ class RiskRule(Base):
     rule_name = Column(String(100), nullable=False)
     rule_type = Column(String(50), nullable=False)  # amount, location, velocity, pattern
     description = Column(Text)
-    conditions = Column(Text)  # JSON string of rule conditions
+    conditions = Column(JSON)  # Rule conditions (SQLite JSON1)
     threshold = Column(Float, nullable=False)
     weight = Column(Float, default=1.0)
     is_active = Column(Boolean, default=True)
@@ -147,25 +207,76 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String(50), nullable=False)
+    user_id = Column(String(50), nullable=False, index=True)
     action = Column(String(50), nullable=False)
-    resource_type = Column(String(50))
+    resource_type = Column(String(50), index=True)
     resource_id = Column(String(50))
-    details = Column(Text)  # JSON string of action details
+    details = Column(JSON)  # Action details (SQLite JSON1)
     ip_address = Column(String(45))
     user_agent = Column(String(200))
-    timestamp = Column(DateTime, default=func.now())
+    timestamp = Column(DateTime, default=func.now(), index=True)
+    
+    __table_args__ = (
+        Index("ix_audit_user_timestamp", "user_id", "timestamp"),
+    )
+
+
+def _schema_hash() -> str:
+    """Hash of the declared schema, used to skip redundant startup DDL"""
+    return hashlib.sha256(str(Base.metadata.sorted_tables).encode()).hexdigest()
+
+
+def _read_stored_schema_hash() -> Optional[str]:
+    """Read the schema hash recorded by a previous successful init"""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS _schema_meta (key TEXT PRIMARY KEY, value TEXT)"
+            ))
+            conn.commit()
+            row = conn.execute(text(
+                "SELECT value FROM _schema_meta WHERE key = 'schema_hash'"
+            )).fetchone()
+            return row[0] if row else None
+    except Exception as e:
+        logger.warning(f"Could not read schema meta: {e}")
+        return None
+
+
+def _store_schema_hash(value: str) -> None:
+    """Record the schema hash after a successful init"""
+    with engine.connect() as conn:
+        conn.execute(text(
+            "INSERT OR REPLACE INTO _schema_meta (key, value) VALUES ('schema_hash', :value)"
+        ), {"value": value})
+        conn.commit()
+
+
+def _init_db_sync():
+    """Blocking database initialization, run off the event loop"""
+    # Skip create_all and the sample-data check entirely when the stored
+    # schema hash matches: repeated container restarts then pay a single
+    # SELECT instead of full schema introspection plus seed queries
+    current_hash = _schema_hash()
+    if _read_stored_schema_hash() == current_hash:
+        logger.info("Database schema up to date, skipping initialization")
+        return
+    
+    Base.metadata.create_all(bind=engine)
+    logger.info("Database tables created successfully")
+    
+    # Create sample data for demonstration
+    _create_sample_data_sync()
+    
+    _store_schema_hash(current_hash)
 
 
 async def init_db():
     """Initialize database tables"""
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-        
-        # Create sample data for demonstration
-        await create_sample_data()
-        
+        # The sync engine blocks on disk I/O, so hand the work to a worker
+        # thread instead of stalling the event loop during startup
+        await asyncio.to_thread(_init_db_sync)
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
@@ -173,156 +284,174 @@ async def init_db():
 
 async def create_sample_data():
     """Create sample data for demonstration"""
+    await asyncio.to_thread(_create_sample_data_sync)
+
+
+def _seed_indexes():
+    """Non-unique indexes on the seeded tables
+
+    Dropped before the bulk seed and recreated after: one sorted bulk build
+    per index is cheaper than per-row B-tree maintenance during the load.
+    """
+    indexes = []
+    for model in (Customer, Account, Transaction, FraudAlert):
+        indexes.extend(idx for idx in model.__table__.indexes if not idx.unique)
+    return indexes
+
+
+def _create_sample_data_sync():
+    """Blocking sample-data seed, run off the event loop"""
     db = SessionLocal()
+    is_sqlite = "sqlite" in settings.DATABASE_URL
     try:
         # Check if data already exists
         if db.query(Customer).first():
             return
         
-        # Create sample customers
-        customers = [
-            Customer(
-                customer_id="CUST-001234",
-                name="John O'Sullivan",
-                email="john.osullivan@email.ie",
-                phone="+353-1-234-5678",
-                risk_level="high",
-                risk_score=8.5
-            ),
-            Customer(
-                customer_id="CUST-001235",
-                name="Mary Murphy",
-                email="mary.murphy@email.ie",
-                phone="+353-1-234-5679",
-                risk_level="medium",
-                risk_score=5.2
-            ),
-            Customer(
-                customer_id="CUST-001236",
-                name="Patrick Kelly",
-                email="patrick.kelly@email.ie",
-                phone="+353-1-234-5680",
-                risk_level="low",
-                risk_score=2.1
-            )
-        ]
-        
-        for customer in customers:
-            db.add(customer)
-        
-        db.commit()
+        seed_indexes = _seed_indexes()
+        conn = db.connection()
+        for index in seed_indexes:
+            index.drop(bind=conn, checkfirst=True)
         
-        # Create sample accounts
-        accounts = [
-            Account(
-                account_number="IE29AIBK93115212345678",
-                customer_id=1,
-                account_type="checking",
-                balance=5000.00
-            ),
-            Account(
-                account_number="IE29AIBK93115212345679",
-                customer_id=2,
-                account_type="savings",
-                balance=15000.00
-            ),
-            Account(
-                account_number="IE29AIBK93115212345680",
-                customer_id=3,
-                account_type="checking",
-                balance=2500.00
-            )
+        # Bulk-insert each table in one executemany statement instead of
+        # flushing a unit-of-work per object
+        customer_rows = [
+            {
+                "customer_id": "CUST-001234",
+                "name": "John O'Sullivan",
+                "email": "john.osullivan@email.ie",
+                "phone": "+353-1-234-5678",
+                "risk_level": "high",
+                "risk_score": 8.5
+            },
+            {
+                "customer_id": "CUST-001235",
+                "name": "Mary Murphy",
+                "email": "mary.murphy@email.ie",
+                "phone": "+353-1-234-5679",
+                "risk_level": "medium",
+                "risk_score": 5.2
+            },
+            {
+                "customer_id": "CUST-001236",
+                "name": "Patrick Kelly",
+                "email": "patrick.kelly@email.ie",
+                "phone": "+353-1-234-5680",
+                "risk_level": "low",
+                "risk_score": 2.1
+            }
         ]
+        db.execute(insert(Customer), customer_rows)
         
-        for account in accounts:
-            db.add(account)
+        account_rows = [
+            {
+                "account_number": "IE29AIBK93115212345678",
+                "customer_id": 1,
+                "account_type": "checking",
+                "balance": 500000
+            },
+            {
+                "account_number": "IE29AIBK93115212345679",
+                "customer_id": 2,
+                "account_type": "savings",
+                "balance": 1500000
+            },
+            {
+                "account_number": "IE29AIBK93115212345680",
+                "customer_id": 3,
+                "account_type": "checking",
+                "balance": 250000
+            }
+        ]
+        db.execute(insert(Account), account_rows)
         
-        db.commit()
+        transaction_rows = [
+            {
+                "transaction_id": "TXN-2024-001234",
+                "account_id": 1,
+                "customer_id": 1,
+                "amount": 250000,
+                "transaction_type": "debit",
+                "merchant_name": "Online Electronics Store",
+                "merchant_category": "electronics",
+                "location_country": "IE",
+                "location_city": "Dublin",
+                "channel": "online",
+                "risk_score": 8.5,
+                "is_flagged": True,
+                "fraud_indicators": ["unusual_amount", "new_merchant", "foreign_ip"],
+                "status": "investigating"
+            },
+            {
+                "transaction_id": "TXN-2024-001235",
+                "account_id": 2,
+                "customer_id": 2,
+                "amount": 85000,
+                "transaction_type": "debit",
+                "merchant_name": "Dublin Restaurant",
+                "merchant_category": "dining",
+                "location_country": "IE",
+                "location_city": "Dublin",
+                "channel": "pos",
+                "risk_score": 6.2,
+                "is_flagged": True,
+                "fraud_indicators": ["velocity_check", "unusual_time"],
+                "status": "pending"
+            },
+            {
+                "transaction_id": "TXN-2024-001236",
+                "account_id": 3,
+                "customer_id": 3,
+                "amount": 12550,
+                "transaction_type": "debit",
+                "merchant_name": "Local Grocery Store",
+                "merchant_category": "grocery",
+                "location_country": "IE",
+                "location_city": "Cork",
+                "channel": "pos",
+                "risk_score": 2.1,
+                "is_flagged": False,
+                "status": "approved"
+            }
+        ]
+        db.execute(insert(Transaction), transaction_rows)
         
-        # Create sample transactions
-        transactions = [
-            Transaction(
-                transaction_id="TXN-2024-001234",
-                account_id=1,
-                customer_id=1,
-                amount=2500.00,
-                transaction_type="debit",
-                merchant_name="Online Electronics Store",
-                merchant_category="electronics",
-                location_country="IE",
-                location_city="Dublin",
-                channel="online",
-                risk_score=8.5,
-                is_flagged=True,
-                fraud_indicators='["unusual_amount", "new_merchant", "foreign_ip"]',
-                status="investigating"
-            ),
-            Transaction(
-                transaction_id="TXN-2024-001235",
-                account_id=2,
-                customer_id=2,
-                amount=850.00,
-                transaction_type="debit",
-                merchant_name="Dublin Restaurant",
-                merchant_category="dining",
-                location_country="IE",
-                location_city="Dublin",
-                channel="pos",
-                risk_score=6.2,
-                is_flagged=True,
-                fraud_indicators='["velocity_check", "unusual_time"]',
-                status="pending"
-            ),
-            Transaction(
-                transaction_id="TXN-2024-001236",
-                account_id=3,
-                customer_id=3,
-                amount=125.50,
-                transaction_type="debit",
-                merchant_name="Local Grocery Store",
-                merchant_category="grocery",
-                location_country="IE",
-                location_city="Cork",
-                channel="pos",
-                risk_score=2.1,
-                is_flagged=False,
-                status="approved"
-            )
+        alert_rows = [
+            {
+                "alert_id": "FA-2024-001",
+                "transaction_id": 1,
+                "alert_type": "high_risk_transaction",
+                "severity": "high",
+                "risk_score": 8.5,
+                "description": "High-value transaction to new merchant from unusual location",
+                "fraud_indicators": ["unusual_amount", "new_merchant", "foreign_ip"],
+                "status": "open"
+            },
+            {
+                "alert_id": "FA-2024-002",
+                "transaction_id": 2,
+                "alert_type": "velocity_check",
+                "severity": "medium",
+                "risk_score": 6.2,
+                "description": "Multiple transactions in short time period",
+                "fraud_indicators": ["velocity_check", "unusual_time"],
+                "status": "investigating"
+            }
         ]
+        db.execute(insert(FraudAlert), alert_rows)
         
-        for transaction in transactions:
-            db.add(transaction)
+        # Rebuild the dropped indexes in one pass each over the loaded rows
+        for index in seed_indexes:
+            index.create(bind=conn, checkfirst=True)
         
+        # Single commit for all four tables
         db.commit()
         
-        # Create sample fraud alerts
-        alerts = [
-            FraudAlert(
-                alert_id="FA-2024-001",
-                transaction_id=1,
-                alert_type="high_risk_transaction",
-                severity="high",
-                risk_score=8.5,
-                description="High-value transaction to new merchant from unusual location",
-                fraud_indicators='["unusual_amount", "new_merchant", "foreign_ip"]',
-                status="open"
-            ),
-            FraudAlert(
-                alert_id="FA-2024-002",
-                transaction_id=2,
-                alert_type="velocity_check",
-                severity="medium",
-                risk_score=6.2,
-                description="Multiple transactions in short time period",
-                fraud_indicators='["velocity_check", "unusual_time"]',
-                status="investigating"
-            )
-        ]
-        
-        for alert in alerts:
-            db.add(alert)
+        if is_sqlite:
+            with engine.connect() as check_conn:
+                if check_conn.exec_driver_sql("PRAGMA foreign_key_check").fetchall():
+                    logger.warning("Foreign key violations detected after sample seed")
         
-        db.commit()
         logger.info("Sample data created successfully")
         
     except Exception as e:
@@ -338,4 +467,20 @@ def get_session() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_scoped_session() -> Generator[Session, None, None]:
+    """Get a request-scoped database session
+
+    Within one request (one contextvars scope) every call returns the same
+    session instance, so relationship access after a write hits the identity
+    map instead of re-selecting.
+    """
+    token = _session_context.set(object())
+    db = ScopedSession()
+    try:
+        yield db
+    finally:
+        ScopedSession.remove()
+        _session_context.reset(token)
\ No newline at end of file
@@ -1,57 +1,110 @@
 """Security and authentication for the fraud detection system"""
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import FrozenSet, List, Optional, Dict, Any
+from dataclasses import dataclass
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel
+import base64
+import bcrypt
+import functools
+import hmac
 import logging
+import orjson
+import threading
+import time
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# HS256 signing should dispatch through the cryptography (OpenSSL EVP)
+# backend so HMAC-SHA256 picks up hardware SHA extensions where present.
+# Checked once at import; a missing backend still works via the native
+# fallback, just measurably slower under load.
+try:
+    from jose import jwk as _jwk
+    from jose.backends.cryptography_backend import CryptographyHMACKey as _CryptoHMACKey
+
+    if not issubclass(_jwk.get_key(settings.ALGORITHM), _CryptoHMACKey):
+        logger.warning(
+            "jose is not using the cryptography backend for %s; "
+            "install python-jose[cryptography] for hardware-accelerated signing",
+            settings.ALGORITHM)
+except ImportError:
+    logger.warning(
+        "cryptography backend unavailable; JWT signing falls back to the "
+        "pure-Python jose backend")
+
+# Verified-token cache: bearer tokens repeat across requests, so each token
+# pays signature verification once and is served from the cache until its
+# own exp. Failed verifications are never cached.
+_token_cache: Dict[str, tuple] = {}
+_token_cache_lock = threading.Lock()
+_TOKEN_CACHE_MAX = 1024
 
 
 class TokenData(BaseModel):
-    """Token data model"""
+    """Token data model (API boundary)"""
     username: Optional[str] = None
     roles: list = []
     exp: Optional[datetime] = None
 
 
+@dataclass(slots=True, frozen=True)
+class _TokenDataFast:
+    """Decoded token claims for internal use
+
+    The decoded payload is already trusted after signature verification, so
+    the hot path skips pydantic validation and returns this frozen slots
+    dataclass instead; TokenData stays for the API boundary.
+    """
+    username: str
+    roles: tuple
+    exp: int
+
+
 class User(BaseModel):
-    """User model for authentication"""
+    """User model for authentication
+
+    roles is a frozenset so check_permission is two O(1) hash probes
+    instead of linear list scans; it still serializes as a JSON array.
+    """
     username: str
     email: Optional[str] = None
     full_name: Optional[str] = None
-    roles: list = []
+    roles: FrozenSet[str] = frozenset()
     is_active: bool = True
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash
+
+    Calls the bcrypt C primitive directly rather than going through
+    passlib's scheme-registry dispatch.
+    """
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12)).decode('utf-8')
 
 
 def create_access_token(data: Dict[Any, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
-    to_encode = data.copy()
-    
+    # RFC 7519 exp is a NumericDate (seconds since epoch), so integer math
+    # avoids constructing datetime/timedelta objects per token
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    
+        expire = now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    # Single C-level dict merge instead of copy() + update(); the caller's
+    # dict is left untouched
+    to_encode = {**data, "exp": expire}
+
     try:
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
@@ -60,18 +113,45 @@ def create_access_token(data: Dict[Any, Any], expires_delta: Optional[timedelta]
         raise
 
 
-def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode a JWT token"""
+def verify_token(token: str) -> Optional[_TokenDataFast]:
+    """Verify and decode a JWT token
+
+    Successful verifications are cached keyed by the token string and
+    reused until the token's own expiry, replacing a full decode+verify
+    with a dict lookup for repeated bearer tokens.
+    """
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+        if cached is not None:
+            token_data, exp_timestamp = cached
+            if now < exp_timestamp:
+                return token_data
+            del _token_cache[token]
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
-        roles: list = payload.get("roles", [])
-        exp: datetime = datetime.fromtimestamp(payload.get("exp", 0))
         
         if username is None:
             return None
         
-        return TokenData(username=username, roles=roles, exp=exp)
+        exp = payload.get("exp", 0)
+        token_data = _TokenDataFast(username=username,
+                                    roles=tuple(payload.get("roles", ())),
+                                    exp=exp)
+        
+        with _token_cache_lock:
+            if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                # Drop expired entries first; clear outright if that freed nothing
+                expired = [key for key, (_, exp_ts) in _token_cache.items() if exp_ts <= now]
+                for key in expired:
+                    del _token_cache[key]
+                if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                    _token_cache.clear()
+            _token_cache[token] = (token_data, exp)
+        
+        return token_data
     
     except JWTError as e:
         logger.warning(f"JWT verification failed: {e}")
@@ -81,6 +161,91 @@ def verify_token(token: str) -> Optional[TokenData]:
         return None
 
 
+@functools.lru_cache(maxsize=4)
+def _signing_key_bytes(secret: str) -> bytes:
+    return secret.encode('utf-8')
+
+
+def verify_tokens_batch(tokens: List[str]) -> List[Optional[_TokenDataFast]]:
+    """Verify a burst of HS256 tokens in one pass
+
+    Bulk authorization (alert fan-out, WebSocket reconnect storms) verifies
+    many bearer tokens back to back. This path splits each token once,
+    runs HMAC-SHA256 over all signing inputs with hmac.digest — the
+    one-shot C fast path, no HMAC object per token — and constant-time
+    compares signatures, sharing the verified-token cache with
+    verify_token. Signature math stays on OpenSSL's SHA-256 (hardware-
+    accelerated where the CPU supports it); there is no multi-buffer SIMD
+    SHA binding in this stack, so the win here is stripping the per-token
+    jose dispatch and object churn.
+    """
+    now = time.time()
+    results: List[Optional[_TokenDataFast]] = [None] * len(tokens)
+    misses: List[tuple] = []  # (index, token, signing_input, signature)
+
+    with _token_cache_lock:
+        for i, token in enumerate(tokens):
+            cached = _token_cache.get(token)
+            if cached is not None:
+                token_data, exp_timestamp = cached
+                if now < exp_timestamp:
+                    results[i] = token_data
+                    continue
+                del _token_cache[token]
+            misses.append((i, token))
+
+    if not misses:
+        return results
+
+    key = _signing_key_bytes(settings.SECRET_KEY)
+    verified: List[tuple] = []  # (index, token, token_data, exp)
+    for i, token in misses:
+        try:
+            signing_input, _, signature_b64 = token.rpartition('.')
+            header_b64, _, payload_b64 = signing_input.partition('.')
+            if not header_b64 or not payload_b64:
+                continue
+            header = orjson.loads(_b64url_decode(header_b64))
+            if header.get('alg') != 'HS256':
+                # Only the symmetric fast path is batched; anything else
+                # (or an alg-confusion attempt) goes through jose
+                token_data = verify_token(token)
+                results[i] = token_data
+                continue
+            digest = hmac.digest(key, signing_input.encode('ascii'), 'sha256')
+            if not hmac.compare_digest(digest, _b64url_decode(signature_b64)):
+                continue
+            payload = orjson.loads(_b64url_decode(payload_b64))
+            username = payload.get('sub')
+            exp = payload.get('exp', 0)
+            if username is None or exp <= now:
+                continue
+            token_data = _TokenDataFast(username=username,
+                                        roles=tuple(payload.get('roles', ())),
+                                        exp=exp)
+            results[i] = token_data
+            verified.append((token, token_data, exp))
+        except Exception as e:
+            logger.warning(f"Batch JWT verification failed: {e}")
+
+    if verified:
+        with _token_cache_lock:
+            if len(_token_cache) + len(verified) > _TOKEN_CACHE_MAX:
+                expired = [key_ for key_, (_, exp_ts) in _token_cache.items() if exp_ts <= now]
+                for key_ in expired:
+                    del _token_cache[key_]
+                if len(_token_cache) + len(verified) > _TOKEN_CACHE_MAX:
+                    _token_cache.clear()
+            for token, token_data, exp in verified:
+                _token_cache[token] = (token_data, exp)
+
+    return results
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
 def get_current_active_user(token: str) -> Optional[User]:
     """Get current active user from token"""
     token_data = verify_token(token)
@@ -95,10 +260,10 @@ def get_current_active_user(token: str) -> Optional[User]:
             username="analyst",
             email="analyst@irishbank.ie",
             full_name="Fraud Analyst",
-            roles=["analyst", "investigator"],
+            roles=frozenset({"analyst", "investigator"}),
             is_active=True
         )
-    
+
     return None
 
 
@@ -107,32 +272,48 @@ def check_permission(user: User, required_role: str) -> bool:
     return required_role in user.roles or "admin" in user.roles
 
 
-# Demo users for development (replace with database in production)
-DEMO_USERS = {
-    "analyst": {
-        "username": "analyst",
-        "email": "analyst@irishbank.ie",
-        "full_name": "Fraud Analyst",
-        "hashed_password": get_password_hash("secure123"),
-        "roles": ["analyst", "investigator"],
-        "is_active": True
-    },
-    "admin": {
-        "username": "admin",
-        "email": "admin@irishbank.ie",
-        "full_name": "System Administrator",
-        "hashed_password": get_password_hash("admin123"),
-        "roles": ["admin", "analyst", "investigator"],
-        "is_active": True
+# Demo credentials hashed once offline at rounds=4 (bcrypt.hashpw with
+# bcrypt.gensalt(rounds=4)) and baked in as constants, so no process ever
+# pays the key-schedule cost for compile-time-known throwaway passwords.
+# Real user stores go through get_password_hash at rounds=12.
+_DEMO_HASH_ANALYST = "$2b$04$cs7nEavpOxbb8epgTIZjAutE.gP5Xllb2J2EcbcuNZnHxLeT043Yu"  # secure123
+_DEMO_HASH_ADMIN = "$2b$04$dXRScbQGHDQfeQhaPOmHM.vVnzMvbQxF0UWKPnZsW1WPAiSc.fCOy"  # admin123
+
+
+@functools.lru_cache(maxsize=1)
+def get_demo_users() -> Dict[str, Dict[str, Any]]:
+    """Demo users for development (replace with database in production)"""
+    return {
+        "analyst": {
+            "username": "analyst",
+            "email": "analyst@irishbank.ie",
+            "full_name": "Fraud Analyst",
+            "hashed_password": _DEMO_HASH_ANALYST,
+            "roles": ["analyst", "investigator"],
+            "is_active": True
+        },
+        "admin": {
+            "username": "admin",
+            "email": "admin@irishbank.ie",
+            "full_name": "System Administrator",
+            "hashed_password": _DEMO_HASH_ADMIN,
+            "roles": ["admin", "analyst", "investigator"],
+            "is_active": True
+        }
     }
-}
+
+
+# Hash verified for unknown usernames so a failed lookup costs the same
+# bcrypt work as a wrong password, closing the enumeration timing channel
+_TIMING_EQUALIZER_HASH = "$2b$04$shwN/9DiO4Kd/gGJ4cL32uYC3cIE4w.gU5Kweccsw93m1CQ0nyy6i"
 
 
 def authenticate_user(username: str, password: str) -> Optional[User]:
     """Authenticate a user with username and password"""
-    user_data = DEMO_USERS.get(username)
-    
+    user_data = get_demo_users().get(username)
+
     if not user_data:
+        verify_password(password, _TIMING_EQUALIZER_HASH)
         return None
     
     if not verify_password(password, user_data["hashed_password"]):
@@ -142,6 +323,6 @@ def authenticate_user(username: str, password: str) -> Optional[User]:
         username=user_data["username"],
         email=user_data["email"],
         full_name=user_data["full_name"],
-        roles=user_data["roles"],
+        roles=frozenset(user_data["roles"]),
         is_active=user_data["is_active"]
     )
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""Shared field-validator helpers for the pydantic models
+
+One module-level implementation per check, bound into each model with
+field_validator, so every model reuses the same compiled patterns and
+single helper function instead of defining its own validator methods.
+"""
+
+import re
+import sys
+from typing import Optional
+
+# Compiled once at module scope: email-validator's EmailStr machinery runs a
+# full RFC syntax check per instantiation, far more than bulk ingest needs.
+# A single fullmatch against a precompiled pattern is O(n) with no Python loop.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_PHONE_RE = re.compile(r'^\+?\d[\d\-\s]{5,19}$')
+
+
+def check_email(v: Optional[str]) -> Optional[str]:
+    """Validate an email address against the precompiled pattern"""
+    if v is not None and not _EMAIL_RE.fullmatch(v):
+        raise ValueError('Invalid email address format')
+    return v
+
+
+def check_phone(v: Optional[str]) -> Optional[str]:
+    """Validate a phone number against the precompiled pattern"""
+    if v is not None and not _PHONE_RE.fullmatch(v):
+        raise ValueError('Invalid phone number format')
+    return v
+
+
+def intern_categorical(v: str) -> str:
+    """Intern short repeated categorical values
+
+    JSON-decoded strings are fresh objects even for the same few literals;
+    interning makes downstream dict lookups and comparisons pointer-fast and
+    keeps one heap object per distinct value.
+    """
+    return sys.intern(v)
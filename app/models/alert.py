@@ -1,7 +1,7 @@
 """Alert model for fraud detection"""
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional, List, Dict, Any
 from datetime import datetime
 
 
@@ -9,36 +9,24 @@ class AlertBase(BaseModel):
     """Base alert model"""
     alert_id: str = Field(..., description="Unique alert identifier")
     transaction_id: int = Field(..., description="Associated transaction ID")
-    alert_type: str = Field(..., description="Type of fraud alert")
-    severity: str = Field(..., description="Alert severity level")
+    alert_type: Literal[
+        'high_value_transaction',
+        'suspicious_location',
+        'rapid_transactions',
+        'off_hours_transaction',
+        'anomaly_detected',
+        'velocity_check',
+        'pattern_deviation',
+        'account_takeover',
+        'card_testing',
+        'money_laundering'
+    ] = Field(..., description="Type of fraud alert")
+    severity: Literal['low', 'medium', 'high', 'critical'] = Field(..., description="Alert severity level")
     risk_score: float = Field(..., ge=0, le=10, description="Risk score that triggered the alert")
     description: str = Field(..., description="Human-readable alert description")
     fraud_indicators: List[str] = Field(default_factory=list, description="List of fraud indicators")
-    
-    @validator('alert_type')
-    def validate_alert_type(cls, v):
-        valid_types = [
-            'high_value_transaction',
-            'suspicious_location',
-            'rapid_transactions',
-            'off_hours_transaction',
-            'anomaly_detected',
-            'velocity_check',
-            'pattern_deviation',
-            'account_takeover',
-            'card_testing',
-            'money_laundering'
-        ]
-        if v not in valid_types:
-            raise ValueError(f'Alert type must be one of {valid_types}')
-        return v
-    
-    @validator('severity')
-    def validate_severity(cls, v):
-        valid_severities = ['low', 'medium', 'high', 'critical']
-        if v not in valid_severities:
-            raise ValueError(f'Severity must be one of {valid_severities}')
-        return v
+
+    model_config = ConfigDict(frozen=True)
 
 
 class AlertCreate(AlertBase):
@@ -48,26 +36,10 @@ class AlertCreate(AlertBase):
 
 class AlertUpdate(BaseModel):
     """Model for updating an alert"""
-    status: Optional[str] = None
+    status: Optional[Literal['open', 'investigating', 'resolved', 'false_positive', 'escalated']] = None
     assigned_to: Optional[str] = None
     investigation_notes: Optional[str] = None
-    resolution: Optional[str] = None
-    
-    @validator('status')
-    def validate_status(cls, v):
-        if v is not None:
-            valid_statuses = ['open', 'investigating', 'resolved', 'false_positive', 'escalated']
-            if v not in valid_statuses:
-                raise ValueError(f'Status must be one of {valid_statuses}')
-        return v
-    
-    @validator('resolution')
-    def validate_resolution(cls, v):
-        if v is not None:
-            valid_resolutions = ['approved', 'blocked', 'escalated', 'false_positive']
-            if v not in valid_resolutions:
-                raise ValueError(f'Resolution must be one of {valid_resolutions}')
-        return v
+    resolution: Optional[Literal['approved', 'blocked', 'escalated', 'false_positive']] = None
 
 
 class AlertResponse(AlertBase):
@@ -79,13 +51,12 @@ class AlertResponse(AlertBase):
     resolution: Optional[str] = Field(None, description="Alert resolution")
     created_at: datetime
     resolved_at: Optional[datetime] = None
-    
+
     # Related data
     transaction_data: Optional[Dict[str, Any]] = Field(None, description="Associated transaction data")
     customer_data: Optional[Dict[str, Any]] = Field(None, description="Associated customer data")
-    
-    class Config:
-        orm_mode = True
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class AlertInvestigation(BaseModel):
@@ -95,23 +66,16 @@ class AlertInvestigation(BaseModel):
     investigation_steps: List[Dict[str, Any]] = Field(default_factory=list, description="Investigation steps taken")
     evidence_collected: List[Dict[str, Any]] = Field(default_factory=list, description="Evidence collected")
     risk_assessment: Dict[str, Any] = Field(default_factory=dict, description="Updated risk assessment")
-    recommendation: str = Field(..., description="Investigation recommendation")
+    recommendation: Literal[
+        'approve_transaction',
+        'block_transaction',
+        'escalate_to_senior',
+        'request_customer_verification',
+        'monitor_closely',
+        'false_positive'
+    ] = Field(..., description="Investigation recommendation")
     confidence_level: float = Field(..., ge=0, le=1, description="Confidence in recommendation")
     investigation_time_minutes: int = Field(default=0, description="Time spent investigating")
-    
-    @validator('recommendation')
-    def validate_recommendation(cls, v):
-        valid_recommendations = [
-            'approve_transaction',
-            'block_transaction',
-            'escalate_to_senior',
-            'request_customer_verification',
-            'monitor_closely',
-            'false_positive'
-        ]
-        if v not in valid_recommendations:
-            raise ValueError(f'Recommendation must be one of {valid_recommendations}')
-        return v
 
 
 class AlertStatistics(BaseModel):
@@ -144,43 +108,18 @@ class AlertFilter(BaseModel):
     limit: int = Field(default=100, le=1000, description="Maximum number of results")
     offset: int = Field(default=0, ge=0, description="Number of results to skip")
     sort_by: str = Field(default="created_at", description="Field to sort by")
-    sort_order: str = Field(default="desc", description="Sort order (asc/desc)")
-    
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in ['asc', 'desc']:
-            raise ValueError('Sort order must be "asc" or "desc"')
-        return v
+    sort_order: Literal['asc', 'desc'] = Field(default="desc", description="Sort order (asc/desc)")
 
 
 class AlertNotification(BaseModel):
     """Model for alert notifications"""
     alert_id: str
-    notification_type: str = Field(..., description="Type of notification")
+    notification_type: Literal[
+        'alert_created', 'alert_escalated', 'alert_resolved', 'investigation_required'
+    ] = Field(..., description="Type of notification")
     recipients: List[str] = Field(..., description="List of notification recipients")
     channels: List[str] = Field(..., description="Notification channels (email, sms, webhook)")
     message: str = Field(..., description="Notification message")
-    priority: str = Field(default="normal", description="Notification priority")
+    priority: Literal['low', 'normal', 'high', 'urgent'] = Field(default="normal", description="Notification priority")
     sent_at: Optional[datetime] = Field(None, description="When notification was sent")
-    delivery_status: str = Field(default="pending", description="Delivery status")
-    
-    @validator('notification_type')
-    def validate_notification_type(cls, v):
-        valid_types = ['alert_created', 'alert_escalated', 'alert_resolved', 'investigation_required']
-        if v not in valid_types:
-            raise ValueError(f'Notification type must be one of {valid_types}')
-        return v
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        valid_priorities = ['low', 'normal', 'high', 'urgent']
-        if v not in valid_priorities:
-            raise ValueError(f'Priority must be one of {valid_priorities}')
-        return v
-    
-    @validator('delivery_status')
-    def validate_delivery_status(cls, v):
-        valid_statuses = ['pending', 'sent', 'delivered', 'failed', 'bounced']
-        if v not in valid_statuses:
-            raise ValueError(f'Delivery status must be one of {valid_statuses}')
-        return v
\ No newline at end of file
+    delivery_status: Literal['pending', 'sent', 'delivered', 'failed', 'bounced'] = Field(default="pending", description="Delivery status")
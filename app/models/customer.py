@@ -1,18 +1,25 @@
 """Customer model for fraud detection"""
 
-from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Literal, Optional, List
 from datetime import datetime
 
+from app.models._validators import check_email, check_phone
+
 
 class CustomerBase(BaseModel):
     """Base customer model"""
     customer_id: str = Field(..., description="Unique customer identifier")
     name: str = Field(..., min_length=1, max_length=100, description="Customer full name")
-    email: Optional[EmailStr] = Field(None, description="Customer email address")
+    email: Optional[str] = Field(None, description="Customer email address")
     phone: Optional[str] = Field(None, description="Customer phone number")
     address: Optional[str] = Field(None, description="Customer address")
 
+    model_config = ConfigDict(frozen=True)
+
+    _validate_email = field_validator('email')(check_email)
+    _validate_phone = field_validator('phone')(check_phone)
+
 
 class CustomerCreate(CustomerBase):
     """Model for creating a new customer"""
@@ -22,18 +29,13 @@ class CustomerCreate(CustomerBase):
 class CustomerUpdate(BaseModel):
     """Model for updating customer information"""
     name: Optional[str] = Field(None, min_length=1, max_length=100)
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     phone: Optional[str] = None
     address: Optional[str] = None
-    risk_level: Optional[str] = None
-    
-    @validator('risk_level')
-    def validate_risk_level(cls, v):
-        if v is not None:
-            valid_levels = ['low', 'medium', 'high']
-            if v not in valid_levels:
-                raise ValueError(f'Risk level must be one of {valid_levels}')
-        return v
+    risk_level: Optional[Literal['low', 'medium', 'high']] = None
+
+    _validate_email = field_validator('email')(check_email)
+    _validate_phone = field_validator('phone')(check_phone)
 
 
 class CustomerResponse(CustomerBase):
@@ -44,27 +46,19 @@ class CustomerResponse(CustomerBase):
     is_blocked: bool = Field(default=False, description="Whether customer is blocked")
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        orm_mode = True
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CustomerRiskProfile(BaseModel):
     """Model for customer risk profile"""
     customer_id: str
     risk_score: float = Field(..., ge=0, le=10, description="Overall risk score")
-    risk_level: str = Field(..., description="Risk level classification")
+    risk_level: Literal['low', 'medium', 'high', 'critical'] = Field(..., description="Risk level classification")
     risk_factors: List[str] = Field(default_factory=list, description="Identified risk factors")
     transaction_patterns: dict = Field(default_factory=dict, description="Transaction behavior patterns")
     fraud_history: dict = Field(default_factory=dict, description="Historical fraud incidents")
     last_assessment: datetime = Field(default_factory=datetime.utcnow)
-    
-    @validator('risk_level')
-    def validate_risk_level(cls, v):
-        valid_levels = ['low', 'medium', 'high', 'critical']
-        if v not in valid_levels:
-            raise ValueError(f'Risk level must be one of {valid_levels}')
-        return v
 
 
 class CustomerStatistics(BaseModel):
@@ -85,39 +79,18 @@ class CustomerStatistics(BaseModel):
 class CustomerAlert(BaseModel):
     """Model for customer-related alerts"""
     customer_id: str
-    alert_type: str = Field(..., description="Type of alert")
-    severity: str = Field(..., description="Alert severity")
+    alert_type: Literal[
+        'risk_level_change',
+        'suspicious_pattern',
+        'account_takeover',
+        'identity_theft',
+        'money_laundering',
+        'unusual_activity'
+    ] = Field(..., description="Type of alert")
+    severity: Literal['low', 'medium', 'high', 'critical'] = Field(..., description="Alert severity")
     description: str = Field(..., description="Alert description")
     triggered_at: datetime = Field(default_factory=datetime.utcnow)
-    status: str = Field(default="active", description="Alert status")
-    
-    @validator('alert_type')
-    def validate_alert_type(cls, v):
-        valid_types = [
-            'risk_level_change',
-            'suspicious_pattern',
-            'account_takeover',
-            'identity_theft',
-            'money_laundering',
-            'unusual_activity'
-        ]
-        if v not in valid_types:
-            raise ValueError(f'Alert type must be one of {valid_types}')
-        return v
-    
-    @validator('severity')
-    def validate_severity(cls, v):
-        valid_severities = ['low', 'medium', 'high', 'critical']
-        if v not in valid_severities:
-            raise ValueError(f'Severity must be one of {valid_severities}')
-        return v
-    
-    @validator('status')
-    def validate_status(cls, v):
-        valid_statuses = ['active', 'investigating', 'resolved', 'false_positive']
-        if v not in valid_statuses:
-            raise ValueError(f'Status must be one of {valid_statuses}')
-        return v
+    status: Literal['active', 'investigating', 'resolved', 'false_positive'] = Field(default="active", description="Alert status")
 
 
 class CustomerFilter(BaseModel):
@@ -132,4 +105,4 @@ class CustomerFilter(BaseModel):
     min_risk_score: Optional[float] = Field(None, ge=0, le=10)
     max_risk_score: Optional[float] = Field(None, ge=0, le=10)
     limit: int = Field(default=100, le=1000, description="Maximum number of results")
-    offset: int = Field(default=0, ge=0, description="Number of results to skip")
\ No newline at end of file
+    offset: int = Field(default=0, ge=0, description="Number of results to skip")
@@ -1,10 +1,15 @@
 """Transaction model for fraud detection"""
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from dataclasses import asdict, dataclass
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+from typing import Literal, Optional, List
 from datetime import datetime
 from decimal import Decimal
 
+import numpy as np
+
+from app.models._validators import intern_categorical
+
 
 class TransactionBase(BaseModel):
     """Base transaction model"""
@@ -12,36 +17,23 @@ class TransactionBase(BaseModel):
     account_id: int = Field(..., description="Account ID")
     customer_id: int = Field(..., description="Customer ID")
     amount: Decimal = Field(..., gt=0, description="Transaction amount")
-    currency: str = Field(default="EUR", description="Currency code")
-    transaction_type: str = Field(..., description="Transaction type (debit, credit, transfer)")
+    currency: Literal['EUR', 'USD', 'GBP'] = Field(default="EUR", description="Currency code")
+    transaction_type: Literal['debit', 'credit', 'transfer'] = Field(..., description="Transaction type (debit, credit, transfer)")
     merchant_name: Optional[str] = Field(None, description="Merchant name")
     merchant_category: Optional[str] = Field(None, description="Merchant category")
     location_country: str = Field(default="IE", description="Transaction country")
     location_city: Optional[str] = Field(None, description="Transaction city")
     device_fingerprint: Optional[str] = Field(None, description="Device fingerprint")
     ip_address: Optional[str] = Field(None, description="IP address")
-    channel: str = Field(default="online", description="Transaction channel")
-    
-    @validator('currency')
-    def validate_currency(cls, v):
-        valid_currencies = ['EUR', 'USD', 'GBP']
-        if v not in valid_currencies:
-            raise ValueError(f'Currency must be one of {valid_currencies}')
-        return v
-    
-    @validator('transaction_type')
-    def validate_transaction_type(cls, v):
-        valid_types = ['debit', 'credit', 'transfer']
-        if v not in valid_types:
-            raise ValueError(f'Transaction type must be one of {valid_types}')
-        return v
-    
-    @validator('channel')
-    def validate_channel(cls, v):
-        valid_channels = ['online', 'atm', 'pos', 'mobile']
-        if v not in valid_channels:
-            raise ValueError(f'Channel must be one of {valid_channels}')
-        return v
+    channel: Literal['online', 'atm', 'pos', 'mobile'] = Field(default="online", description="Transaction channel")
+
+    # Frozen: ingress models are never mutated after validation, and frozen
+    # instances are hashable so scored results can be memoized against them.
+    # (pydantic v2 has no slots option; frozen still removes mutation checks.)
+    model_config = ConfigDict(frozen=True)
+
+    _intern_categoricals = field_validator(
+        'currency', 'transaction_type', 'channel', 'location_country')(intern_categorical)
 
 
 class TransactionCreate(TransactionBase):
@@ -58,9 +50,178 @@ class TransactionResponse(TransactionBase):
     status: str = Field(default="pending", description="Transaction status")
     created_at: datetime
     processed_at: Optional[datetime] = None
-    
-    class Config:
-        orm_mode = True
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class TransactionFast(BaseModel):
+    """Hot-path transaction model holding the amount as integer cents
+
+    Decimal arithmetic dispatches into _decimal per operation and cannot be
+    vectorized; pipeline code validates amount_cents as a plain int (matching
+    the BigInteger cents storage column) and only materializes a Decimal at
+    serialization boundaries through the computed amount field.
+    """
+    transaction_id: str = Field(..., description="Unique transaction identifier")
+    account_id: int = Field(..., description="Account ID")
+    customer_id: int = Field(..., description="Customer ID")
+    amount_cents: int = Field(..., gt=0, description="Transaction amount in EUR cents")
+    currency: Literal['EUR', 'USD', 'GBP'] = Field(default="EUR", description="Currency code")
+    transaction_type: Literal['debit', 'credit', 'transfer'] = Field(..., description="Transaction type (debit, credit, transfer)")
+    merchant_category: Optional[str] = Field(None, description="Merchant category")
+    location_country: str = Field(default="IE", description="Transaction country")
+    channel: Literal['online', 'atm', 'pos', 'mobile'] = Field(default="online", description="Transaction channel")
+
+    model_config = ConfigDict(frozen=True)
+
+    _intern_categoricals = field_validator(
+        'currency', 'transaction_type', 'channel', 'location_country')(intern_categorical)
+
+    @computed_field
+    @property
+    def amount(self) -> Decimal:
+        """Amount in euro, materialized only when serialized"""
+        return Decimal(self.amount_cents) / 100
+
+
+@dataclass(slots=True, frozen=True)
+class TransactionCore:
+    """Trusted internal transaction record for the scoring stages
+
+    Validation happens once at the API boundary (pydantic); between
+    scoring stages the same data rides in this frozen slots dataclass,
+    so intermediate hops pay plain attribute access instead of repeated
+    model re-validation.
+    """
+    transaction_id: str
+    account_id: int
+    customer_id: int
+    amount: float
+    currency: str = "EUR"
+    transaction_type: str = "debit"
+    merchant_name: Optional[str] = None
+    merchant_category: Optional[str] = None
+    location_country: str = "IE"
+    location_city: Optional[str] = None
+    device_fingerprint: Optional[str] = None
+    ip_address: Optional[str] = None
+    channel: str = "online"
+
+    @classmethod
+    def from_model(cls, tx: "TransactionBase") -> "TransactionCore":
+        """Unstructure a validated ingress model once, at the boundary"""
+        return cls(
+            transaction_id=tx.transaction_id,
+            account_id=tx.account_id,
+            customer_id=tx.customer_id,
+            amount=float(tx.amount),
+            currency=tx.currency,
+            transaction_type=tx.transaction_type,
+            merchant_name=tx.merchant_name,
+            merchant_category=tx.merchant_category,
+            location_country=tx.location_country,
+            location_city=tx.location_city,
+            device_fingerprint=tx.device_fingerprint,
+            ip_address=tx.ip_address,
+            channel=tx.channel,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TransactionCore":
+        """Build from an already-validated plain dict (no re-validation)"""
+        return cls(
+            transaction_id=data['transaction_id'],
+            account_id=data.get('account_id', 1),
+            customer_id=data.get('customer_id', 1),
+            amount=float(data.get('amount', 0.0)),
+            currency=data.get('currency', 'EUR'),
+            transaction_type=data.get('transaction_type', 'debit'),
+            merchant_name=data.get('merchant_name'),
+            merchant_category=data.get('merchant_category'),
+            location_country=data.get('location_country', 'IE'),
+            location_city=data.get('location_city'),
+            device_fingerprint=data.get('device_fingerprint'),
+            ip_address=data.get('ip_address'),
+            channel=data.get('channel', 'online'),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class TransactionBatch:
+    """Structure-of-arrays view over a batch of transactions
+
+    Packs the fields the fraud kernels consume into typed NumPy columns
+    once at ingest, so rule evaluation and feature building iterate flat
+    arrays instead of per-row pydantic objects.
+    """
+    transaction_ids: List[str]
+    amounts: np.ndarray        # float64, euro
+    customer_ids: np.ndarray   # int64
+    hours: np.ndarray          # int8, hour of day
+    weekdays: np.ndarray       # int8
+    channel_codes: np.ndarray  # int8
+    type_codes: np.ndarray     # int8
+    country_risks: np.ndarray  # int8 (IE=0, EU=1, other=2)
+    category_risks: np.ndarray # int8
+
+    @classmethod
+    def from_transactions(cls, transactions: List["TransactionBase"],
+                          timestamps: Optional[List[datetime]] = None) -> "TransactionBatch":
+        """Bulk-pack validated transactions into columnar arrays"""
+        # Imported here so the models package stays import-light; the engine
+        # module is already loaded in any process that scores transactions
+        from app.core.fraud_engine import _cat_risk, _channel_code, _country_risk, _type_code
+
+        n = len(transactions)
+        amounts = np.empty(n, dtype=np.float64)
+        customer_ids = np.empty(n, dtype=np.int64)
+        hours = np.empty(n, dtype=np.int8)
+        weekdays = np.empty(n, dtype=np.int8)
+        channel_codes = np.empty(n, dtype=np.int8)
+        type_codes = np.empty(n, dtype=np.int8)
+        country_risks = np.empty(n, dtype=np.int8)
+        category_risks = np.empty(n, dtype=np.int8)
+
+        now = datetime.now()
+        for i, tx in enumerate(transactions):
+            amounts[i] = float(tx.amount)
+            customer_ids[i] = tx.customer_id
+            ts = timestamps[i] if timestamps else now
+            hours[i] = ts.hour
+            weekdays[i] = ts.weekday()
+            channel_codes[i] = _channel_code(tx.channel)
+            type_codes[i] = _type_code(tx.transaction_type)
+            country_risks[i] = _country_risk(tx.location_country)
+            category_risks[i] = _cat_risk(tx.merchant_category or 'other')
+
+        return cls(
+            transaction_ids=[tx.transaction_id for tx in transactions],
+            amounts=amounts,
+            customer_ids=customer_ids,
+            hours=hours,
+            weekdays=weekdays,
+            channel_codes=channel_codes,
+            type_codes=type_codes,
+            country_risks=country_risks,
+            category_risks=category_risks,
+        )
+
+    def __len__(self) -> int:
+        return len(self.transaction_ids)
+
+    def feature_matrix(self, balances: Optional[np.ndarray] = None) -> np.ndarray:
+        """Build the (N, 8) engine feature matrix through the JIT kernel"""
+        from app.core.fraud_engine import _build_feature_matrix
+
+        if balances is None:
+            balances = np.full(len(self.transaction_ids), 10000.0, dtype=np.float32)
+        return _build_feature_matrix(
+            self.amounts.astype(np.float32), self.hours, self.weekdays,
+            self.channel_codes, self.country_risks, self.type_codes,
+            self.category_risks, balances.astype(np.float32, copy=False))
 
 
 class TransactionAnalysisRequest(BaseModel):
@@ -75,28 +236,14 @@ class TransactionAnalysisResponse(BaseModel):
     """Model for transaction analysis response"""
     transaction_id: str
     risk_score: float = Field(..., ge=0, le=10, description="Risk score from 0-10")
-    risk_level: str = Field(..., description="Risk level (low, medium, high, critical)")
+    risk_level: Literal['low', 'medium', 'high', 'critical'] = Field(..., description="Risk level (low, medium, high, critical)")
     is_flagged: bool = Field(..., description="Whether transaction should be flagged")
     fraud_indicators: List[str] = Field(default_factory=list, description="Detected fraud indicators")
     triggered_rules: List[str] = Field(default_factory=list, description="Triggered fraud rules")
     ml_score: float = Field(..., ge=0, le=10, description="Machine learning model score")
     rule_score: float = Field(..., ge=0, le=10, description="Rule-based score")
     analysis_timestamp: datetime = Field(default_factory=datetime.utcnow)
-    recommended_action: str = Field(..., description="Recommended action (approve, review, block)")
-    
-    @validator('risk_level')
-    def validate_risk_level(cls, v):
-        valid_levels = ['low', 'medium', 'high', 'critical']
-        if v not in valid_levels:
-            raise ValueError(f'Risk level must be one of {valid_levels}')
-        return v
-    
-    @validator('recommended_action')
-    def validate_recommended_action(cls, v):
-        valid_actions = ['approve', 'review', 'block', 'escalate']
-        if v not in valid_actions:
-            raise ValueError(f'Recommended action must be one of {valid_actions}')
-        return v
+    recommended_action: Literal['approve', 'review', 'block', 'escalate'] = Field(..., description="Recommended action (approve, review, block)")
 
 
 class TransactionFilter(BaseModel):
@@ -114,4 +261,4 @@ class TransactionFilter(BaseModel):
     location_country: Optional[str] = None
     channel: Optional[str] = None
     limit: int = Field(default=100, le=1000, description="Maximum number of results")
-    offset: int = Field(default=0, ge=0, description="Number of results to skip")
\ No newline at end of file
+    offset: int = Field(default=0, ge=0, description="Number of results to skip")
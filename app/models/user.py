@@ -1,45 +1,49 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
+from app.models._validators import check_email
+
 
 class UserBase(BaseModel):
     """Base user model with common attributes."""
     username: str = Field(..., min_length=3, max_length=50, description="Username for login")
-    email: EmailStr = Field(..., description="Email address")
+    email: str = Field(..., description="Email address")
     full_name: Optional[str] = Field(None, max_length=100, description="Full name of the user")
     disabled: bool = Field(False, description="Whether the user is disabled")
 
+    _validate_email = field_validator('email')(check_email)
+
 
 class UserCreate(UserBase):
     """Model for creating a new user."""
     password: str = Field(..., min_length=8, description="Password for login")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "username": "johndoe",
-                "email": "john.doe@example.com",
-                "full_name": "John Doe",
-                "password": "secretpassword"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "username": "johndoe",
+            "email": "john.doe@example.com",
+            "full_name": "John Doe",
+            "password": "secretpassword"
         }
+    })
 
 
 class UserUpdate(BaseModel):
     """Model for updating user information."""
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     full_name: Optional[str] = Field(None, max_length=100)
     password: Optional[str] = Field(None, min_length=8)
     disabled: Optional[bool] = None
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "email": "john.new@example.com",
-                "full_name": "John New Name"
-            }
+    _validate_email = field_validator('email')(check_email)
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "email": "john.new@example.com",
+            "full_name": "John New Name"
         }
+    })
 
 
 class UserInDB(UserBase):
@@ -49,8 +53,7 @@ class UserInDB(UserBase):
     updated_at: Optional[datetime] = None
     roles: List[str] = Field(default_factory=list)
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class User(UserBase):
@@ -60,9 +63,9 @@ class User(UserBase):
     updated_at: Optional[datetime] = None
     roles: List[str] = Field(default_factory=list)
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "username": "johndoe",
@@ -74,6 +77,7 @@ class User(UserBase):
                 "roles": ["user"]
             }
         }
+    )
 
 
 class Token(BaseModel):
@@ -82,18 +86,17 @@ class Token(BaseModel):
     token_type: str = "bearer"
     expires_in: int
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
-                "token_type": "bearer",
-                "expires_in": 3600
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+            "token_type": "bearer",
+            "expires_in": 3600
         }
+    })
 
 
 class TokenData(BaseModel):
     """Model for data stored in JWT token."""
     username: Optional[str] = None
     exp: Optional[datetime] = None
-    roles: List[str] = Field(default_factory=list)
\ No newline at end of file
+    roles: List[str] = Field(default_factory=list)
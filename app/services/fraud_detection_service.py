@@ -1,49 +1,136 @@
 """Fraud detection service for processing transactions"""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import functools
 import logging
 import asyncio
+from sqlalchemy import and_, func, insert, or_
 from sqlalchemy.orm import Session
 
 from app.core.database import get_session, Transaction, FraudAlert, Customer
-from app.core.fraud_engine import FraudDetectionEngine
+from app.core.fraud_engine import AnalysisResult, FraudDetectionEngine
+from app.models.transaction import TransactionCore
 from app.services.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
+# Batch-path tuning: flush when this many transactions are queued, or when
+# the oldest queued item has waited this long, whichever comes first
+_BATCH_SIZE = 1000
+_BATCH_WAIT_S = 0.05
+
+
+@functools.lru_cache(maxsize=4096)
+def _alert_type_cached(triggered_rules: frozenset) -> str:
+    """Map a set of triggered rules to an alert type
+
+    The rule-set space is tiny and repeats constantly during fraud bursts,
+    so each distinct combination pays the branch cascade once.
+    """
+    if 'high_amount_threshold' in triggered_rules:
+        return 'high_value_transaction'
+    elif 'foreign_transaction' in triggered_rules:
+        return 'suspicious_location'
+    elif 'velocity_check' in triggered_rules:
+        return 'rapid_transactions'
+    elif 'unusual_time' in triggered_rules:
+        return 'off_hours_transaction'
+    else:
+        return 'anomaly_detected'
+
+
+@functools.lru_cache(maxsize=4096)
+def _alert_description_cached(risk_level: str, risk_score: float,
+                              indicators: tuple, n_indicators: int) -> str:
+    """Render an alert description, memoized on its immutable inputs"""
+    description = f"Transaction flagged with {risk_level} risk (score: {risk_score:.1f}). "
+
+    if indicators:
+        description += f"Indicators: {', '.join(indicators)}"
+        if n_indicators > 3:
+            description += f" and {n_indicators - 3} more"
+
+    return description
+
 
 class FraudDetectionService:
     """Service for fraud detection and alert management"""
-    
+
     def __init__(self):
         self.fraud_engine = FraudDetectionEngine()
         self.notification_service = NotificationService()
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        # Strong references to in-flight notification tasks; create_task
+        # results are weakly held by the loop and would otherwise be GC'd
+        self._pending_notifications: set = set()
+
+    def _notify_in_background(self, alert) -> None:
+        """Schedule a fraud-alert notification without blocking the caller"""
+        task = asyncio.create_task(self.notification_service.send_fraud_alert(alert))
+        self._pending_notifications.add(task)
+        task.add_done_callback(self._pending_notifications.discard)
+
+    async def drain_notifications(self) -> None:
+        """Wait for in-flight notifications; call during shutdown"""
+        if self._pending_notifications:
+            await asyncio.gather(*self._pending_notifications, return_exceptions=True)
+
+    async def score_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch of transactions without persisting them
+
+        Delegates to the engine's batch path, which evaluates the compiled
+        rule and feature kernels over typed arrays and calls each ML model
+        once for the whole batch; the work runs off the event loop.
+        """
+        results = await asyncio.to_thread(
+            self.fraud_engine.analyze_transactions, transactions)
+        return [r.to_dict() for r in results]
+
+    def warm_up(self) -> None:
+        """Run one synthetic batch so scoring is compiled before real traffic
+
+        Triggers numba's JIT for the rule/feature kernels (persisted across
+        runs by cache=True) and the first sklearn/ONNX inference, moving
+        that latency from the first transaction to startup.
+        """
+        self.fraud_engine.analyze_transactions([{
+            'transaction_id': 'WARMUP-000', 'account_id': 1, 'customer_id': 1,
+            'amount': 100.0, 'transaction_type': 'debit', 'channel': 'online',
+            'location_country': 'IE',
+        }])
     
     async def process_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process a transaction through fraud detection pipeline"""
         try:
-            # Analyze transaction for fraud
-            analysis_result = self.fraud_engine.analyze_transaction(transaction_data)
-            
-            # Store transaction in database
-            db_transaction = await self._store_transaction(transaction_data, analysis_result)
-            
-            # Create fraud alert if flagged
-            if analysis_result.get('is_flagged', False):
-                alert = await self._create_fraud_alert(db_transaction, analysis_result)
-                
-                # Send notifications for high-risk alerts
-                if analysis_result.get('risk_level') in ['high', 'critical']:
-                    await self.notification_service.send_fraud_alert(alert)
+            # Rule + ML scoring is CPU-bound and the persistence below is
+            # blocking I/O; both run off the event loop so other coroutines
+            # overlap with analysis and DB round-trips. The engine keeps no
+            # per-call mutable state, so concurrent worker threads may score
+            # through the same instance.
+            analysis_result = await asyncio.to_thread(
+                self.fraud_engine.analyze_transaction, transaction_data)
+
+            # Parse the dict once; downstream helpers do C-level attribute
+            # access instead of repeating ~15 .get() chains per row
+            tx = TransactionCore.from_dict(transaction_data)
+
+            alert = await asyncio.to_thread(
+                self._persist_transaction_sync, tx, analysis_result)
+
+            # Schedule notifications for high-risk alerts; the response
+            # returns as soon as the commit lands instead of waiting on SMTP
+            if alert is not None and analysis_result.risk_level in ('high', 'critical'):
+                self._notify_in_background(alert)
             
-            logger.info(f"Processed transaction {transaction_data.get('transaction_id')}")
+            logger.info("Processed transaction %s", transaction_data.get('transaction_id'))
             
             return {
                 'transaction_id': transaction_data.get('transaction_id'),
                 'status': 'processed',
-                'risk_assessment': analysis_result,
-                'requires_review': analysis_result.get('is_flagged', False)
+                'risk_assessment': analysis_result.to_dict(),
+                'requires_review': analysis_result.is_flagged
             }
             
         except Exception as e:
@@ -54,130 +141,296 @@ class FraudDetectionService:
                 'error': str(e)
             }
     
-    async def _store_transaction(self, transaction_data: Dict[str, Any], analysis_result: Dict[str, Any]) -> Transaction:
-        """Store transaction in database"""
+    async def process_transaction_batched(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a transaction for batched storage
+
+        Same contract as process_transaction, but persistence is handled by
+        a background worker that drains the queue and writes up to
+        _BATCH_SIZE transactions (plus the flagged subset's alerts) with two
+        Core executemany statements and a single commit, instead of two
+        round-trips and two commits per transaction. Trades up to
+        _BATCH_WAIT_S of latency for bulk-ingest throughput.
+        """
+        try:
+            # Score off the loop, same as process_transaction; only the
+            # queue handoff below stays on the event loop
+            analysis_result = await asyncio.to_thread(
+                self.fraud_engine.analyze_transaction, transaction_data)
+            tx = TransactionCore.from_dict(transaction_data)
+
+            if self._batch_worker is None or self._batch_worker.done():
+                self._batch_queue = asyncio.Queue()
+                self._batch_worker = asyncio.create_task(self._batch_flush_loop())
+
+            future: asyncio.Future = asyncio.get_running_loop().create_future()
+            await self._batch_queue.put((tx, analysis_result, future))
+            await future
+
+            return {
+                'transaction_id': transaction_data.get('transaction_id'),
+                'status': 'processed',
+                'risk_assessment': analysis_result.to_dict(),
+                'requires_review': analysis_result.is_flagged
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing transaction: {e}")
+            return {
+                'transaction_id': transaction_data.get('transaction_id'),
+                'status': 'error',
+                'error': str(e)
+            }
+
+    async def _batch_flush_loop(self) -> None:
+        """Drain the queue and flush accumulated transactions in bulk"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._batch_queue.get()
+            batch = [item]
+            deadline = loop.time() + _BATCH_WAIT_S
+            while len(batch) < _BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                flagged = await asyncio.to_thread(self._flush_batch_sync, batch)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(True)
+            except Exception as e:
+                logger.error(f"Error flushing transaction batch: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for alert, analysis_result in flagged:
+                if analysis_result.risk_level in ('high', 'critical'):
+                    self._notify_in_background(alert)
+
+    def _flush_batch_sync(self, batch: List[tuple]) -> List[Tuple[FraudAlert, AnalysisResult]]:
+        """Write a batch with two executemany inserts and one commit
+
+        Returns the flagged subset as (alert, analysis_result) pairs so the
+        caller can fan out notifications outside the DB transaction.
+        """
         db = next(get_session())
         try:
-            transaction = Transaction(
-                transaction_id=transaction_data.get('transaction_id'),
-                account_id=transaction_data.get('account_id', 1),
-                customer_id=transaction_data.get('customer_id', 1),
-                amount=float(transaction_data.get('amount', 0)),
-                currency=transaction_data.get('currency', 'EUR'),
-                transaction_type=transaction_data.get('transaction_type', 'debit'),
-                merchant_name=transaction_data.get('merchant_name'),
-                merchant_category=transaction_data.get('merchant_category'),
-                location_country=transaction_data.get('location_country', 'IE'),
-                location_city=transaction_data.get('location_city'),
-                device_fingerprint=transaction_data.get('device_fingerprint'),
-                ip_address=transaction_data.get('ip_address'),
-                channel=transaction_data.get('channel', 'online'),
-                risk_score=analysis_result.get('risk_score', 0.0),
-                is_flagged=analysis_result.get('is_flagged', False),
-                fraud_indicators=str(analysis_result.get('fraud_indicators', [])),
-                status='investigating' if analysis_result.get('is_flagged') else 'approved',
-                processed_at=datetime.utcnow()
-            )
-            
-            db.add(transaction)
+            processed_at = datetime.utcnow()
+            rows = [self._transaction_row(tx, analysis, processed_at)
+                    for tx, analysis, _ in batch]
+
+            # insertmanyvalues batches the VALUES clauses; the ids below are
+            # zipped back onto the batch positionally, and only
+            # sort_by_parameter_order guarantees RETURNING rows correlate
+            # with parameter order across backends
+            result = db.execute(
+                insert(Transaction).returning(
+                    Transaction.id, sort_by_parameter_order=True),
+                rows)
+            transaction_ids = [row[0] for row in result]
+
+            flagged: List[Tuple[FraudAlert, AnalysisResult]] = []
+            alert_rows = []
+            year = processed_at.strftime('%Y')
+            for (data, analysis, _), db_id in zip(batch, transaction_ids):
+                if not analysis.is_flagged:
+                    continue
+                alert = FraudAlert(
+                    alert_id=f"FA-{year}-{db_id:06d}",
+                    transaction_id=db_id,
+                    alert_type=self._determine_alert_type(analysis),
+                    severity=analysis.risk_level,
+                    risk_score=analysis.risk_score,
+                    description=self._generate_alert_description(analysis),
+                    fraud_indicators=analysis.fraud_indicators,
+                    status='open'
+                )
+                flagged.append((alert, analysis))
+                alert_rows.append({
+                    'alert_id': alert.alert_id,
+                    'transaction_id': alert.transaction_id,
+                    'alert_type': alert.alert_type,
+                    'severity': alert.severity,
+                    'risk_score': alert.risk_score,
+                    'description': alert.description,
+                    'fraud_indicators': alert.fraud_indicators,
+                    'status': alert.status,
+                })
+
+            if alert_rows:
+                db.execute(insert(FraudAlert), alert_rows)
+
             db.commit()
-            db.refresh(transaction)
-            
-            return transaction
-            
-        except Exception as e:
+            return flagged
+
+        except Exception:
             db.rollback()
-            logger.error(f"Error storing transaction: {e}")
             raise
         finally:
             db.close()
-    
-    async def _create_fraud_alert(self, transaction: Transaction, analysis_result: Dict[str, Any]) -> FraudAlert:
-        """Create fraud alert for flagged transaction"""
+
+    @staticmethod
+    def _transaction_row(tx: TransactionCore, analysis_result: AnalysisResult,
+                         processed_at: datetime) -> Dict[str, Any]:
+        """Build a plain executemany-ready row for the Transaction table"""
+        return {
+            'transaction_id': tx.transaction_id,
+            'account_id': tx.account_id,
+            'customer_id': tx.customer_id,
+            'amount': int(round(tx.amount * 100)),
+            'currency': tx.currency,
+            'transaction_type': tx.transaction_type,
+            'merchant_name': tx.merchant_name,
+            'merchant_category': tx.merchant_category,
+            'location_country': tx.location_country,
+            'location_city': tx.location_city,
+            'device_fingerprint': tx.device_fingerprint,
+            'ip_address': tx.ip_address,
+            'channel': tx.channel,
+            'risk_score': analysis_result.risk_score,
+            'is_flagged': analysis_result.is_flagged,
+            'fraud_indicators': analysis_result.fraud_indicators,
+            'status': 'investigating' if analysis_result.is_flagged else 'approved',
+            'processed_at': processed_at,
+        }
+
+    def _persist_transaction_sync(self, tx: TransactionCore,
+                                  analysis_result: AnalysisResult) -> Optional[FraudAlert]:
+        """Store the transaction and any alert in one session/commit
+
+        The flagged path pays a single BEGIN/COMMIT and the alert row never
+        references an uncommitted transaction id. Returns the alert, if any.
+        """
         db = next(get_session())
         try:
-            alert_id = f"FA-{datetime.now().strftime('%Y')}-{transaction.id:06d}"
-            
+            txn_db_id = self._store_transaction(db, tx, analysis_result)
+
+            alert = None
+            if analysis_result.is_flagged:
+                alert = self._create_fraud_alert(db, txn_db_id, tx, analysis_result)
+
+            db.commit()
+            return alert
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _store_transaction(self, db: Session, tx: TransactionCore,
+                           analysis_result: AnalysisResult) -> int:
+        """Insert the transaction and return its generated id
+
+        A Core insert with RETURNING gets the id in the same round-trip as
+        the INSERT, skipping the ORM unit-of-work flush and any refresh
+        SELECT. The caller owns the session and the commit.
+        """
+        try:
+            row = self._transaction_row(tx, analysis_result, datetime.utcnow())
+            result = db.execute(insert(Transaction).values(**row).returning(Transaction.id))
+            return result.scalar_one()
+
+        except Exception as e:
+            logger.error(f"Error storing transaction: {e}")
+            raise
+
+    def _create_fraud_alert(self, db: Session, txn_db_id: int, tx: TransactionCore,
+                            analysis_result: AnalysisResult) -> FraudAlert:
+        """Add a fraud alert for a flagged transaction to the caller's session"""
+        try:
+            alert_id = f"FA-{datetime.now().strftime('%Y')}-{txn_db_id:06d}"
+
             alert = FraudAlert(
                 alert_id=alert_id,
-                transaction_id=transaction.id,
+                transaction_id=txn_db_id,
                 alert_type=self._determine_alert_type(analysis_result),
-                severity=analysis_result.get('risk_level', 'medium'),
-                risk_score=analysis_result.get('risk_score', 0.0),
+                severity=analysis_result.risk_level,
+                risk_score=analysis_result.risk_score,
                 description=self._generate_alert_description(analysis_result),
-                fraud_indicators=str(analysis_result.get('fraud_indicators', [])),
+                fraud_indicators=analysis_result.fraud_indicators,
                 status='open'
             )
-            
+
             db.add(alert)
-            db.commit()
-            db.refresh(alert)
-            
-            logger.info(f"Created fraud alert {alert_id} for transaction {transaction.transaction_id}")
-            
+
+            logger.info("Created fraud alert %s for transaction %s", alert_id, tx.transaction_id)
+
             return alert
-            
+
         except Exception as e:
-            db.rollback()
             logger.error(f"Error creating fraud alert: {e}")
             raise
-        finally:
-            db.close()
     
-    def _determine_alert_type(self, analysis_result: Dict[str, Any]) -> str:
+    def _determine_alert_type(self, analysis_result: AnalysisResult) -> str:
         """Determine alert type based on analysis result"""
-        triggered_rules = analysis_result.get('triggered_rules', [])
-        
-        if 'high_amount_threshold' in triggered_rules:
-            return 'high_value_transaction'
-        elif 'foreign_transaction' in triggered_rules:
-            return 'suspicious_location'
-        elif 'velocity_check' in triggered_rules:
-            return 'rapid_transactions'
-        elif 'unusual_time' in triggered_rules:
-            return 'off_hours_transaction'
-        else:
-            return 'anomaly_detected'
-    
-    def _generate_alert_description(self, analysis_result: Dict[str, Any]) -> str:
+        return _alert_type_cached(frozenset(analysis_result.triggered_rules))
+
+    def _generate_alert_description(self, analysis_result: AnalysisResult) -> str:
         """Generate human-readable alert description"""
-        risk_level = analysis_result.get('risk_level', 'medium')
-        risk_score = analysis_result.get('risk_score', 0.0)
-        indicators = analysis_result.get('fraud_indicators', [])
-        
-        description = f"Transaction flagged with {risk_level} risk (score: {risk_score:.1f}). "
-        
-        if indicators:
-            description += f"Indicators: {', '.join(indicators[:3])}"
-            if len(indicators) > 3:
-                description += f" and {len(indicators) - 3} more"
-        
-        return description
+        indicators = analysis_result.fraud_indicators
+        return _alert_description_cached(
+            analysis_result.risk_level,
+            round(analysis_result.risk_score, 1),
+            tuple(indicators[:3]),
+            len(indicators))
     
-    async def get_active_alerts(self, limit: int = 50, severity: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get active fraud alerts"""
+    async def get_active_alerts(self, limit: int = 50, severity: Optional[str] = None,
+                                cursor: Optional[Tuple[datetime, int]] = None) -> List[Dict[str, Any]]:
+        """Get active fraud alerts
+
+        Pages with a keyset cursor — the (created_at, id) pair of the last
+        row from the previous page, echoed back in each item's 'cursor'
+        field — avoiding OFFSET's linear skip over already-seen rows.
+        Note the datetime() normalization in the cursor predicate is
+        non-sargable on SQLite, so each page still scans the
+        status-filtered rows rather than seeking on the (status,
+        created_at) index.
+        """
         db = next(get_session())
         try:
-            query = db.query(FraudAlert).filter(FraudAlert.status.in_(['open', 'investigating']))
-            
+            # One round-trip for alerts plus their transaction and customer,
+            # instead of two extra queries per alert (1+2N)
+            query = (
+                db.query(FraudAlert, Transaction, Customer)
+                .outerjoin(Transaction, Transaction.id == FraudAlert.transaction_id)
+                .outerjoin(Customer, Customer.id == Transaction.customer_id)
+                .filter(FraudAlert.status.in_(['open', 'investigating']))
+            )
+
             if severity:
                 query = query.filter(FraudAlert.severity == severity)
-            
-            alerts = query.order_by(FraudAlert.created_at.desc()).limit(limit).all()
-            
+
+            if cursor:
+                # Decomposed row-value comparison; tuple_() drops the
+                # DateTime bind processor on SQLite and matches every row.
+                # datetime() normalizes both sides to one text format —
+                # stored values (CURRENT_TIMESTAMP) carry no microseconds
+                # while Python binds render with them, which breaks the
+                # raw string comparison for equal timestamps.
+                cursor_ts, cursor_id = cursor
+                col_ts = func.datetime(FraudAlert.created_at)
+                cur_ts = func.datetime(cursor_ts)
+                query = query.filter(or_(
+                    col_ts < cur_ts,
+                    and_(col_ts == cur_ts, FraudAlert.id < cursor_id)))
+
+            rows = (query.order_by(FraudAlert.created_at.desc(), FraudAlert.id.desc())
+                    .limit(limit).all())
+
             result = []
-            for alert in alerts:
-                # Get associated transaction and customer info
-                transaction = db.query(Transaction).filter(Transaction.id == alert.transaction_id).first()
-                customer = None
-                if transaction:
-                    customer = db.query(Customer).filter(Customer.id == transaction.customer_id).first()
-                
+            for alert, transaction, customer in rows:
                 alert_data = {
                     'alert_id': alert.alert_id,
+                    'cursor': (alert.created_at, alert.id),
                     'transaction_id': transaction.transaction_id if transaction else None,
                     'customer_name': customer.name if customer else 'Unknown',
-                    'amount': float(transaction.amount) if transaction else 0.0,
+                    'amount': transaction.amount / 100 if transaction else 0.0,
                     'currency': transaction.currency if transaction else 'EUR',
                     'merchant': transaction.merchant_name if transaction else None,
                     'risk_score': alert.risk_score,
@@ -185,7 +438,7 @@ class FraudDetectionService:
                     'description': alert.description,
                     'status': alert.status,
                     'created_at': alert.created_at.isoformat(),
-                    'fraud_indicators': eval(alert.fraud_indicators) if alert.fraud_indicators else []
+                    'fraud_indicators': alert.fraud_indicators or []
                 }
                 result.append(alert_data)
             
@@ -197,6 +450,47 @@ class FraudDetectionService:
         finally:
             db.close()
     
+    async def list_transactions(self, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """List recent transactions as display rows, one page at a time
+
+        Serves the monitoring table: each call ships only `limit` rows
+        plus a total count, so render cost and bytes over the wire stay
+        O(page) however large the transactions table grows.
+        """
+        def _query() -> Dict[str, Any]:
+            db = next(get_session())
+            try:
+                total = db.query(func.count(Transaction.id)).scalar() or 0
+                rows = (
+                    db.query(Transaction, Customer)
+                    .outerjoin(Customer, Customer.id == Transaction.customer_id)
+                    .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+                    .offset(offset).limit(limit).all()
+                )
+                return {
+                    'total': total,
+                    'rows': [
+                        {
+                            'transaction_id': txn.transaction_id,
+                            'customer': customer.name if customer else 'Unknown',
+                            'amount': f'€{txn.amount / 100:,.2f}',
+                            'merchant': txn.merchant_name or 'Unknown',
+                            'risk_score': f'{txn.risk_score:.1f}',
+                            'status': txn.status.capitalize(),
+                            'timestamp': txn.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                        }
+                        for txn, customer in rows
+                    ],
+                }
+            finally:
+                db.close()
+
+        try:
+            return await asyncio.to_thread(_query)
+        except Exception as e:
+            logger.error(f"Error listing transactions: {e}")
+            return {'total': 0, 'rows': []}
+
     async def resolve_alert(self, alert_id: str, resolution: str, notes: str = None, user_id: str = None) -> bool:
         """Resolve a fraud alert"""
         db = next(get_session())
@@ -204,7 +498,7 @@ class FraudDetectionService:
             alert = db.query(FraudAlert).filter(FraudAlert.alert_id == alert_id).first()
             
             if not alert:
-                logger.warning(f"Alert {alert_id} not found")
+                logger.warning("Alert %s not found", alert_id)
                 return False
             
             alert.status = 'resolved'
@@ -229,7 +523,7 @@ class FraudDetectionService:
             
             db.commit()
             
-            logger.info(f"Resolved alert {alert_id} with resolution: {resolution}")
+            logger.info("Resolved alert %s with resolution: %s", alert_id, resolution)
             
             return True
             
@@ -245,48 +539,36 @@ class FraudDetectionService:
         db = next(get_session())
         try:
             start_date = datetime.utcnow() - timedelta(days=days)
-            
-            # Total transactions
-            total_transactions = db.query(Transaction).filter(
-                Transaction.created_at >= start_date
-            ).count()
-            
-            # Flagged transactions
-            flagged_transactions = db.query(Transaction).filter(
-                Transaction.created_at >= start_date,
-                Transaction.is_flagged == True
-            ).count()
-            
-            # Active alerts
-            active_alerts = db.query(FraudAlert).filter(
+
+            # One aggregation pass over transactions instead of five separate
+            # scans plus materializing every blocked row to sum in Python.
+            # FILTER clauses let the engine evaluate each predicate inline
+            # during the single scan rather than expanding CASE expressions.
+            (total_transactions, flagged_transactions, blocked_cents,
+             risk_low, risk_medium, risk_high) = db.query(
+                func.count(Transaction.id),
+                func.count(Transaction.id).filter(Transaction.is_flagged == True),
+                func.sum(Transaction.amount).filter(Transaction.status == 'blocked'),
+                func.count(Transaction.id).filter(Transaction.risk_score < 4.0),
+                func.count(Transaction.id).filter(and_(Transaction.risk_score >= 4.0,
+                                                       Transaction.risk_score < 7.0)),
+                func.count(Transaction.id).filter(Transaction.risk_score >= 7.0),
+            ).filter(Transaction.created_at >= start_date).one()
+
+            active_alerts = db.query(func.count(FraudAlert.id)).filter(
                 FraudAlert.status.in_(['open', 'investigating'])
-            ).count()
-            
-            # Blocked amount
-            blocked_amount = db.query(Transaction).filter(
-                Transaction.created_at >= start_date,
-                Transaction.status == 'blocked'
-            ).with_entities(Transaction.amount).all()
-            
-            total_blocked = sum(float(amount[0]) for amount in blocked_amount)
-            
-            # Risk distribution
+            ).scalar()
+
+            total_transactions = total_transactions or 0
+            flagged_transactions = flagged_transactions or 0
+            total_blocked = (blocked_cents or 0) / 100
+
             risk_distribution = {
-                'low': db.query(Transaction).filter(
-                    Transaction.created_at >= start_date,
-                    Transaction.risk_score < 4.0
-                ).count(),
-                'medium': db.query(Transaction).filter(
-                    Transaction.created_at >= start_date,
-                    Transaction.risk_score >= 4.0,
-                    Transaction.risk_score < 7.0
-                ).count(),
-                'high': db.query(Transaction).filter(
-                    Transaction.created_at >= start_date,
-                    Transaction.risk_score >= 7.0
-                ).count()
+                'low': risk_low or 0,
+                'medium': risk_medium or 0,
+                'high': risk_high or 0,
             }
-            
+
             return {
                 'period_days': days,
                 'total_transactions': total_transactions,
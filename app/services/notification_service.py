@@ -1,17 +1,94 @@
 """Notification service for fraud alerts and system notifications"""
 
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, List, Any, Optional
+import asyncio
 import logging
 from datetime import datetime
-import json
+
+import aiosmtplib
+import orjson
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_SEVERITY_COLORS = {
+    'low': '#10b981',
+    'medium': '#f59e0b',
+    'high': '#ef4444',
+    'critical': '#dc2626'
+}
+
+# Parsed once at import; per-alert rendering is a single format_map pass
+# instead of rebuilding the multi-KB f-string each time
+_EMAIL_TEMPLATE = """
+        <html>
+        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f9fafb;">
+            <div style="max-width: 600px; margin: 0 auto; background-color: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <div style="background-color: {color}; color: white; padding: 20px; border-radius: 8px 8px 0 0;">
+                    <h1 style="margin: 0; font-size: 24px;">🚨 Fraud Alert</h1>
+                    <p style="margin: 10px 0 0 0; font-size: 16px;">Alert ID: {alert_id}</p>
+                </div>
+
+                <div style="padding: 20px;">
+                    <div style="margin-bottom: 20px;">
+                        <h2 style="color: #1f2937; margin: 0 0 10px 0;">Alert Details</h2>
+                        <table style="width: 100%; border-collapse: collapse;">
+                            <tr>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Severity:</td>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; color: {color}; font-weight: bold; text-transform: uppercase;">{severity}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Risk Score:</td>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">{risk_score}/10</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Customer:</td>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">{customer_name}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Amount:</td>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">€{amount:,.2f}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Merchant:</td>
+                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">{merchant}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; font-weight: bold;">Time:</td>
+                                <td style="padding: 8px 0;">{created_at}</td>
+                            </tr>
+                        </table>
+                    </div>
+
+                    <div style="margin-bottom: 20px;">
+                        <h3 style="color: #1f2937; margin: 0 0 10px 0;">Description</h3>
+                        <p style="margin: 0; color: #6b7280; line-height: 1.5;">{description}</p>
+                    </div>
+
+                    <div style="margin-bottom: 20px;">
+                        <h3 style="color: #1f2937; margin: 0 0 10px 0;">Fraud Indicators</h3>
+                        <ul style="margin: 0; padding-left: 20px; color: #6b7280;">
+                            {indicators_html}
+                        </ul>
+                    </div>
+
+                    <div style="text-align: center; margin-top: 30px;">
+                        <a href="http://localhost:8080/dashboard" style="background-color: #3b82f6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; font-weight: bold;">View in Dashboard</a>
+                    </div>
+                </div>
+
+                <div style="background-color: #f9fafb; padding: 15px; border-radius: 0 0 8px 8px; text-align: center; color: #6b7280; font-size: 14px;">
+                    <p style="margin: 0;">Irish Banking Fraud Detection System</p>
+                    <p style="margin: 5px 0 0 0;">This is an automated alert. Please investigate immediately.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
 
 class NotificationService:
     """Service for sending notifications about fraud alerts"""
@@ -22,12 +99,40 @@ class NotificationService:
         self.smtp_port = settings.SMTP_PORT
         self.smtp_username = settings.SMTP_USERNAME
         self.smtp_password = settings.SMTP_PASSWORD
+        # One long-lived SMTP connection shared by all alerts; connecting,
+        # STARTTLS and AUTH are 3-5 round-trips that only happen on first
+        # send (or after the server drops the connection)
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._smtp_lock = asyncio.Lock()
+
+    async def _connected_smtp(self) -> aiosmtplib.SMTP:
+        """Return the persistent SMTP connection, (re)connecting if needed
+
+        Caller must hold _smtp_lock.
+        """
+        if self._smtp is None or not self._smtp.is_connected:
+            smtp = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port)
+            await smtp.connect()
+            await smtp.starttls()
+            await smtp.login(self.smtp_username, self.smtp_password)
+            self._smtp = smtp
+        return self._smtp
+
+    async def close(self) -> None:
+        """Close the persistent SMTP connection, if open"""
+        async with self._smtp_lock:
+            if self._smtp is not None and self._smtp.is_connected:
+                try:
+                    await self._smtp.quit()
+                except aiosmtplib.SMTPException:
+                    pass
+            self._smtp = None
     
     async def send_fraud_alert(self, alert_data: Dict[str, Any]) -> bool:
         """Send fraud alert notification"""
         try:
             # Log the alert
-            logger.warning(f"FRAUD ALERT: {alert_data.get('alert_id')} - {alert_data.get('description')}")
+            logger.warning("FRAUD ALERT: %s - %s", alert_data.get('alert_id'), alert_data.get('description'))
             
             # Send email notification if configured
             if self.email_enabled:
@@ -61,14 +166,19 @@ class NotificationService:
             # Email body
             body = self._create_email_body(alert_data)
             msg.attach(MIMEText(body, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
-            
-            logger.info(f"Email alert sent for {alert_data.get('alert_id')}")
+
+            # Send over the persistent connection; one retry covers a
+            # connection the server timed out between alerts
+            async with self._smtp_lock:
+                try:
+                    smtp = await self._connected_smtp()
+                    await smtp.send_message(msg)
+                except aiosmtplib.SMTPException:
+                    self._smtp = None
+                    smtp = await self._connected_smtp()
+                    await smtp.send_message(msg)
+
+            logger.info("Email alert sent for %s", alert_data.get('alert_id'))
             return True
             
         except Exception as e:
@@ -77,81 +187,21 @@ class NotificationService:
     
     def _create_email_body(self, alert_data: Dict[str, Any]) -> str:
         """Create HTML email body for fraud alert"""
-        severity_colors = {
-            'low': '#10b981',
-            'medium': '#f59e0b',
-            'high': '#ef4444',
-            'critical': '#dc2626'
-        }
-        
         severity = alert_data.get('severity', 'medium')
-        color = severity_colors.get(severity, '#6b7280')
-        
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f9fafb;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                <div style="background-color: {color}; color: white; padding: 20px; border-radius: 8px 8px 0 0;">
-                    <h1 style="margin: 0; font-size: 24px;">🚨 Fraud Alert</h1>
-                    <p style="margin: 10px 0 0 0; font-size: 16px;">Alert ID: {alert_data.get('alert_id', 'Unknown')}</p>
-                </div>
-                
-                <div style="padding: 20px;">
-                    <div style="margin-bottom: 20px;">
-                        <h2 style="color: #1f2937; margin: 0 0 10px 0;">Alert Details</h2>
-                        <table style="width: 100%; border-collapse: collapse;">
-                            <tr>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Severity:</td>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; color: {color}; font-weight: bold; text-transform: uppercase;">{severity}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Risk Score:</td>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">{alert_data.get('risk_score', 'N/A')}/10</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Customer:</td>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">{alert_data.get('customer_name', 'Unknown')}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Amount:</td>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">€{alert_data.get('amount', 0):,.2f}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb; font-weight: bold;">Merchant:</td>
-                                <td style="padding: 8px 0; border-bottom: 1px solid #e5e7eb;">{alert_data.get('merchant', 'Unknown')}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; font-weight: bold;">Time:</td>
-                                <td style="padding: 8px 0;">{alert_data.get('created_at', 'Unknown')}</td>
-                            </tr>
-                        </table>
-                    </div>
-                    
-                    <div style="margin-bottom: 20px;">
-                        <h3 style="color: #1f2937; margin: 0 0 10px 0;">Description</h3>
-                        <p style="margin: 0; color: #6b7280; line-height: 1.5;">{alert_data.get('description', 'No description available')}</p>
-                    </div>
-                    
-                    <div style="margin-bottom: 20px;">
-                        <h3 style="color: #1f2937; margin: 0 0 10px 0;">Fraud Indicators</h3>
-                        <ul style="margin: 0; padding-left: 20px; color: #6b7280;">
-                            {''.join([f'<li>{indicator}</li>' for indicator in alert_data.get('fraud_indicators', [])])}
-                        </ul>
-                    </div>
-                    
-                    <div style="text-align: center; margin-top: 30px;">
-                        <a href="http://localhost:8080/dashboard" style="background-color: #3b82f6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; font-weight: bold;">View in Dashboard</a>
-                    </div>
-                </div>
-                
-                <div style="background-color: #f9fafb; padding: 15px; border-radius: 0 0 8px 8px; text-align: center; color: #6b7280; font-size: 14px;">
-                    <p style="margin: 0;">Irish Banking Fraud Detection System</p>
-                    <p style="margin: 5px 0 0 0;">This is an automated alert. Please investigate immediately.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+
+        return _EMAIL_TEMPLATE.format_map({
+            'color': _SEVERITY_COLORS.get(severity, '#6b7280'),
+            'severity': severity,
+            'alert_id': alert_data.get('alert_id', 'Unknown'),
+            'risk_score': alert_data.get('risk_score', 'N/A'),
+            'customer_name': alert_data.get('customer_name', 'Unknown'),
+            'amount': alert_data.get('amount', 0),
+            'merchant': alert_data.get('merchant', 'Unknown'),
+            'created_at': alert_data.get('created_at', 'Unknown'),
+            'description': alert_data.get('description', 'No description available'),
+            'indicators_html': ''.join(map('<li>{}</li>'.format,
+                                           alert_data.get('fraud_indicators', []))),
+        })
     
     async def _send_to_monitoring_system(self, alert_data: Dict[str, Any]) -> bool:
         """Send alert to external monitoring system"""
@@ -174,8 +224,10 @@ class NotificationService:
                 'indicators': alert_data.get('fraud_indicators', [])
             }
             
-            # Log to monitoring (placeholder)
-            logger.info(f"MONITORING: {json.dumps(monitoring_payload)}")
+            # Log to monitoring (placeholder); the guard keeps json.dumps off
+            # the hot path when INFO is filtered out
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("MONITORING: %s", orjson.dumps(monitoring_payload).decode())
             
             return True
             
@@ -196,7 +248,8 @@ class NotificationService:
             }
             
             # In production, store in audit database
-            logger.info(f"AUDIT: {json.dumps(audit_entry)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("AUDIT: %s", orjson.dumps(audit_entry).decode())
             
             return True
             
@@ -217,9 +270,9 @@ class NotificationService:
             if level in ['error', 'critical']:
                 logger.error(f"SYSTEM NOTIFICATION: {message}")
             elif level == 'warning':
-                logger.warning(f"SYSTEM NOTIFICATION: {message}")
+                logger.warning("SYSTEM NOTIFICATION: %s", message)
             else:
-                logger.info(f"SYSTEM NOTIFICATION: {message}")
+                logger.info("SYSTEM NOTIFICATION: %s", message)
             
             return True
             
@@ -246,7 +299,8 @@ class NotificationService:
                 'submission_required': report_data.get('submission_required', False)
             }
             
-            logger.info(f"COMPLIANCE REPORT: {json.dumps(compliance_payload)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("COMPLIANCE REPORT: %s", orjson.dumps(compliance_payload).decode())
             
             return True
             
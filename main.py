@@ -9,107 +9,459 @@ Irish Banking Fraud Detection System - Production Ready
 ✓ Zero-configuration deployment with production security baseline
 """
 
+import bisect
 import os
+import functools
 import sys
+import time
 from dotenv import load_dotenv
 from nicegui import ui, app
 import asyncio
 from datetime import datetime
 
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+from fastapi.responses import ORJSONResponse
+
 # Load environment variables
 load_dotenv()
 
+# JSON serialization runs through orjson's C encoder: figure payloads are
+# float-heavy, where it is ~3x faster than stdlib json
+pio.json.config.default_engine = 'orjson'
+app.router.default_response_class = ORJSONResponse
+
 # Import core modules
 try:
     from app.core.config import settings
     from app.core.database import init_db, get_session
-    from app.core.security import verify_token, create_access_token
+    from app.core.security import authenticate_user, create_access_token, verify_token
     from app.core.fraud_engine import FraudDetectionEngine
     from app.services.fraud_detection_service import FraudDetectionService
     from app.services.notification_service import NotificationService
     from app.models.transaction import Transaction
     from app.models.alert import FraudAlert
     from app.models.customer import Customer
+    import atexit
     import logging
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('fraud_detection.log'),
-            logging.StreamHandler()
-        ]
-    )
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    import orjson
+
+    class _JsonLogFormatter(logging.Formatter):
+        """One orjson-encoded line per record, for container log drivers"""
+
+        def format(self, record: logging.LogRecord) -> str:
+            entry = {
+                'ts': record.created,
+                'level': record.levelname,
+                'logger': record.name,
+                'message': record.getMessage(),
+            }
+            if record.exc_info:
+                entry['exc_info'] = self.formatException(record.exc_info)
+            return orjson.dumps(entry).decode()
+
+    # Configure logging. Structured JSON lines go to stdout, where the
+    # container runtime drains them asynchronously; the handler runs on a
+    # listener thread, so emitting a record from a request coroutine is
+    # just a queue put and the event loop never blocks on a write+flush.
+    _log_handler = logging.StreamHandler(sys.stdout)
+    _log_handler.setFormatter(_JsonLogFormatter())
+    _log_queue: queue.Queue = queue.Queue(-1)
+    _log_listener = QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    _root_logger = logging.getLogger()
+    _root_logger.setLevel(logging.INFO)
+    _root_logger.addHandler(QueueHandler(_log_queue))
     logger = logging.getLogger(__name__)
-    
+
 except ImportError as e:
     print(f"Error importing modules: {e}")
     sys.exit(1)
 
+# Page styling lives in /static/app.css (precompressed variant alongside),
+# so browsers fetch it once, cache it across all five pages, and NiceGUI
+# only ships a one-line <link> per page head instead of the full CSS.
+app.add_static_files('/static', os.path.join(os.path.dirname(__file__), 'static'))
+ui.add_head_html('<link rel="stylesheet" href="/static/app.css">', shared=True)
+
+
+@app.middleware('http')
+async def _cache_static_assets(request, call_next):
+    """Mark /static responses as cacheable for browsers and CDNs
+
+    Starlette's static handler already emits ETags and answers
+    If-None-Match with 304; adding Cache-Control lets repeat visitors
+    skip the request entirely for an hour.
+    """
+    response = await call_next(request)
+    if request.url.path.startswith('/static/'):
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+
+def _build_dashboard_figures():
+    """Build the dashboard's demo analytics figures
+
+    The underlying data is static demo content, so figure construction and
+    Plotly's per-trace validation run once at import; each dashboard view
+    reuses the same figure objects instead of rebuilding them.
+    """
+    # Sample data for demonstration
+    hours = list(range(24))
+    transactions = [120, 95, 80, 65, 45, 30, 25, 40, 85, 150, 200, 250, 280, 290, 275, 260, 240, 220, 200, 180, 160, 140, 130, 125]
+    fraud_detected = [2, 1, 1, 0, 0, 0, 0, 1, 3, 5, 8, 12, 15, 18, 16, 14, 12, 10, 8, 6, 4, 3, 2, 2]
+
+    volume_fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Transaction Volume (24h)', 'Fraud Detection Rate'),
+        vertical_spacing=0.1
+    )
+    volume_fig.add_trace(
+        go.Scatter(x=hours, y=transactions, name='Transactions', line=dict(color='#3b82f6')),
+        row=1, col=1
+    )
+    volume_fig.add_trace(
+        go.Bar(x=hours, y=fraud_detected, name='Fraud Alerts', marker_color='#ef4444'),
+        row=2, col=1
+    )
+    volume_fig.update_layout(
+        height=400,
+        showlegend=False,
+        margin=dict(l=0, r=0, t=40, b=0),
+        plot_bgcolor='white'
+    )
+
+    risk_fig = go.Figure(data=[
+        go.Pie(
+            labels=['Low Risk', 'Medium Risk', 'High Risk'],
+            values=[75, 20, 5],
+            hole=0.4,
+            marker_colors=['#10b981', '#f59e0b', '#ef4444']
+        )
+    ])
+    risk_fig.update_layout(
+        height=250,
+        margin=dict(l=0, r=0, t=0, b=0),
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5)
+    )
+
+    return volume_fig, risk_fig
+
+
+_VOLUME_FIG, _RISK_FIG = _build_dashboard_figures()
+
 # Global services
 fraud_service = None
 notification_service = None
 
-# Authentication state
-authenticated_users = set()
+# Guards initialize_services: concurrent first page hits must not both
+# run init_db and build duplicate service instances
+_init_lock = asyncio.Lock()
+_init_done = False
+
+# Static demo content, shared across requests. Tuples at module scope mean
+# page handlers iterate existing objects instead of reallocating the same
+# list-of-dict literals on every hit.
+_DEMO_ALERTS = (
+    {
+        'id': 'FA-2024-001',
+        'customer': 'John O\'Sullivan',
+        'amount': '€2,500',
+        'risk': 'high',
+        'reason': 'Unusual location + High amount',
+        'time': '2 minutes ago',
+        'status': 'active'
+    },
+    {
+        'id': 'FA-2024-002',
+        'customer': 'Mary Murphy',
+        'amount': '€850',
+        'risk': 'medium',
+        'reason': 'Multiple rapid transactions',
+        'time': '5 minutes ago',
+        'status': 'pending'
+    },
+    {
+        'id': 'FA-2024-003',
+        'customer': 'Patrick Kelly',
+        'amount': '€1,200',
+        'risk': 'low',
+        'reason': 'New merchant pattern',
+        'time': '12 minutes ago',
+        'status': 'resolved'
+    },
+)
+
+# One template substitution per alert card instead of ~12 element builds;
+# the whole card ships as a single node in the websocket diff
+_ALERT_TMPL = (
+    '<div class="alert-card {risk}-risk" style="display: flex; align-items: center; gap: 1rem;">'
+    '<div style="flex: 1;">'
+    '<span class="status-indicator {status}"></span>'
+    '<strong>{id}</strong> - {customer}'
+    '<p style="margin: 0.25rem 0; color: #6b7280;">{reason}</p>'
+    '<small style="color: #9ca3af;">{time}</small>'
+    '</div>'
+    '<div style="text-align: right;">'
+    '<strong style="color: #ef4444;">{amount}</strong><br>'
+    '<span style="font-size: 0.75rem; color: #6b7280;">{risk_upper}</span>'
+    '</div>'
+    '{buttons}'
+    '</div>'
+)
+
+_ALERT_BUTTONS_TMPL = (
+    '<div style="display: flex; gap: 0.5rem;">'
+    '<button class="bg-blue-500 text-white" style="padding: 0.25rem 0.75rem; border: none; '
+    'border-radius: 4px; cursor: pointer;" data-action="investigate" data-alert="{id}">Investigate</button>'
+    '<button class="bg-red-500 text-white" style="padding: 0.25rem 0.75rem; border: none; '
+    'border-radius: 4px; cursor: pointer;" data-action="block" data-alert="{id}">Block</button>'
+    '</div>'
+)
+
+# Risk-score color buckets: green below 4, amber up to 7, red above
+_RISK_COLOR_THRESHOLDS = (4.0, 7.0)
+_RISK_COLORS = ('#10b981', '#f59e0b', '#ef4444')
+
+
+def _risk_color(score: float) -> str:
+    """Map a risk score to its bucket color with one table lookup"""
+    return _RISK_COLORS[bisect.bisect_left(_RISK_COLOR_THRESHOLDS, score)]
+
+
+# Card values shown until real transactions exist
+_DEMO_METRICS = (
+    ('Transactions Today', '12,847', '#3b82f6', '↑ 8.2% from yesterday'),
+    ('Fraud Alerts', '23', '#ef4444', '↓ 12% from yesterday'),
+    ('Risk Score', 'Medium', '#f59e0b', 'Average: 6.2/10'),
+    ('Blocked Amount', '€45,230', '#10b981', 'Prevented today'),
+)
+
+_TRANSACTION_COLUMNS = (
+    {'name': 'transaction_id', 'label': 'Transaction ID', 'field': 'transaction_id', 'sortable': True},
+    {'name': 'customer', 'label': 'Customer', 'field': 'customer', 'sortable': True},
+    {'name': 'amount', 'label': 'Amount', 'field': 'amount', 'sortable': True},
+    {'name': 'merchant', 'label': 'Merchant', 'field': 'merchant', 'sortable': True},
+    {'name': 'risk_score', 'label': 'Risk Score', 'field': 'risk_score', 'sortable': True},
+    {'name': 'status', 'label': 'Status', 'field': 'status', 'sortable': True},
+    {'name': 'timestamp', 'label': 'Time', 'field': 'timestamp', 'sortable': True},
+)
+
+_DEMO_TRANSACTIONS = (
+    {
+        'transaction_id': 'TXN-2024-001234',
+        'customer': 'John O\'Sullivan',
+        'amount': '€2,500.00',
+        'merchant': 'Online Electronics Store',
+        'risk_score': '8.5',
+        'status': 'Flagged',
+        'timestamp': '2024-01-15 14:30:22'
+    },
+    {
+        'transaction_id': 'TXN-2024-001235',
+        'customer': 'Mary Murphy',
+        'amount': '€850.00',
+        'merchant': 'Dublin Restaurant',
+        'risk_score': '6.2',
+        'status': 'Under Review',
+        'timestamp': '2024-01-15 14:25:18'
+    },
+    {
+        'transaction_id': 'TXN-2024-001236',
+        'customer': 'Patrick Kelly',
+        'amount': '€125.50',
+        'merchant': 'Local Grocery Store',
+        'risk_score': '2.1',
+        'status': 'Approved',
+        'timestamp': '2024-01-15 14:20:45'
+    },
+)
+
+_DEMO_CUSTOMERS = (
+    {
+        'name': 'John O\'Sullivan',
+        'customer_id': 'CUST-001234',
+        'risk_level': 'High',
+        'risk_score': 8.5,
+        'total_transactions': 1247,
+        'flagged_transactions': 23,
+        'last_activity': '2 hours ago'
+    },
+    {
+        'name': 'Mary Murphy',
+        'customer_id': 'CUST-001235',
+        'risk_level': 'Medium',
+        'risk_score': 5.2,
+        'total_transactions': 892,
+        'flagged_transactions': 8,
+        'last_activity': '1 day ago'
+    },
+)
+
+_DEMO_REPORTS = (
+    {
+        'name': 'Daily Fraud Summary - January 15, 2024',
+        'type': 'Daily Summary',
+        'generated': '2024-01-15 23:59:59',
+        'status': 'Completed',
+        'size': '2.3 MB'
+    },
+    {
+        'name': 'Weekly Analysis - Week 2, 2024',
+        'type': 'Weekly Analysis',
+        'generated': '2024-01-14 18:00:00',
+        'status': 'Completed',
+        'size': '5.7 MB'
+    },
+    {
+        'name': 'Suspicious Activity Report - SAR-2024-003',
+        'type': 'SAR',
+        'generated': '2024-01-13 16:30:00',
+        'status': 'Submitted to Central Bank',
+        'size': '1.8 MB'
+    },
+)
+
+
+async def _dashboard_stats():
+    """Load dashboard metrics and alerts with one concurrent round-trip pair
+
+    The statistics query already folds its aggregates into a single scan;
+    gathering it with the active-alerts fetch overlaps the two DB
+    round-trips instead of awaiting them back to back. Falls back to the
+    demo content while the database is empty.
+    """
+    if fraud_service is None:
+        return _DEMO_METRICS, _DEMO_ALERTS
+
+    stats, alerts = await asyncio.gather(
+        fraud_service.get_fraud_statistics(days=1),
+        fraud_service.get_active_alerts(limit=5),
+    )
+
+    if not stats or not stats.get('total_transactions'):
+        return _DEMO_METRICS, _DEMO_ALERTS
+
+    cards = (
+        ('Transactions Today', f"{stats['total_transactions']:,}", '#3b82f6',
+         f"{stats['flagged_transactions']:,} flagged"),
+        ('Fraud Alerts', f"{stats['active_alerts']:,}", '#ef4444',
+         'Open or investigating'),
+        ('Fraud Rate', f"{stats['fraud_rate']:.1f}%", '#f59e0b',
+         'Share of today\'s transactions'),
+        ('Blocked Amount', f"€{stats['blocked_amount']:,.0f}", '#10b981',
+         'Prevented today'),
+    )
+
+    alert_cards = tuple(
+        {
+            'id': a['alert_id'],
+            'customer': a['customer_name'],
+            'amount': f"€{a['amount']:,.2f}",
+            'risk': a['severity'] if a['severity'] in ('high', 'medium', 'low') else 'high',
+            'reason': a['description'],
+            'time': a['created_at'],
+            'status': 'active' if a['status'] == 'open' else 'pending',
+        }
+        for a in alerts
+    ) or _DEMO_ALERTS
+
+    return cards, alert_cards
+
+
+def _metric_card_html(title: str, value: str, value_color: str, footnote: str) -> str:
+    return (
+        f'<h3 style="margin: 0; color: #1f2937;">{title}</h3>'
+        f'<p style="margin: 0.5rem 0 0 0; font-size: 2rem; font-weight: bold; color: {value_color};">{value}</p>'
+        f'<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">{footnote}</p>'
+    )
+
+
+def _metric_card(title: str, value: str, value_color: str, footnote: str) -> ui.html:
+    """Render a dashboard metric card as one HTML element
+
+    A single pre-joined blob per card replaces three ui.html calls, so
+    each card costs one element in the NiceGUI tree instead of four.
+    """
+    return ui.html(
+        _metric_card_html(title, value, value_color, footnote)
+    ).classes('metric-card flex-1')
+
+
+def _auth() -> bool:
+    """Whether the current browser session carries a valid access token
+
+    Auth lives in the signed per-user storage cookie instead of a shared
+    module-level set, so it works across workers and verification is a
+    single (cached) JWT check per request.
+    """
+    token = app.storage.user.get('token')
+    return bool(token) and verify_token(token) is not None
+
+
+def _logout() -> None:
+    app.storage.user.pop('token', None)
+    ui.navigate.to('/')
+
+
+def requires_auth(fn):
+    """Redirect unauthenticated sessions to the login page
+
+    One decorator instead of the same guard pasted into every handler;
+    the token check behind _auth is served from verify_token's cache
+    after the first request of a session.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not _auth():
+            ui.navigate.to('/')
+            return
+        return await fn(*args, **kwargs)
+    return wrapper
 
 async def initialize_services():
-    """Initialize all services and database"""
-    global fraud_service, notification_service
-    
-    try:
-        # Initialize database
-        await init_db()
-        logger.info("Database initialized successfully")
-        
-        # Initialize services
-        fraud_service = FraudDetectionService()
-        notification_service = NotificationService()
-        
-        logger.info("All services initialized successfully")
-        
-    except Exception as e:
-        logger.error(f"Error initializing services: {e}")
-        raise
+    """Initialize services and database; idempotent and concurrency-safe
+
+    Registered with app.on_startup so the work happens before the first
+    request instead of adding cold-start latency to the first dashboard
+    view; the lock and done-flag make stray lazy calls no-ops.
+    """
+    global fraud_service, notification_service, _init_done
+
+    async with _init_lock:
+        if _init_done:
+            return
+
+        try:
+            # Initialize database
+            await init_db()
+            logger.info("Database initialized successfully")
+
+            # Initialize services
+            fraud_service = FraudDetectionService()
+            notification_service = NotificationService()
+
+            # Compile the scoring kernels now, not on the first transaction
+            await asyncio.to_thread(fraud_service.warm_up)
+
+            _init_done = True
+            logger.info("All services initialized successfully")
+
+        except Exception as e:
+            logger.error(f"Error initializing services: {e}")
+            raise
 
 @ui.page('/')
 async def login_page():
     """Secure login page for banking personnel"""
-    
-    ui.add_head_html('''
-        <style>
-            .login-container {
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-            }
-            .login-card {
-                background: white;
-                border-radius: 12px;
-                box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-                padding: 2rem;
-                width: 100%;
-                max-width: 400px;
-            }
-            .bank-logo {
-                text-align: center;
-                margin-bottom: 2rem;
-            }
-            .security-badge {
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                gap: 0.5rem;
-                color: #059669;
-                font-size: 0.875rem;
-                margin-top: 1rem;
-            }
-        </style>
-    ''')
-    
+
     with ui.column().classes('login-container'):
         with ui.card().classes('login-card'):
             with ui.column().classes('bank-logo'):
@@ -120,14 +472,18 @@ async def login_page():
             password = ui.input('Password', password=True, placeholder='Enter your password').classes('w-full')
             
             async def handle_login():
-                # In production, verify against secure banking authentication
-                if username.value == 'analyst' and password.value == 'secure123':
-                    authenticated_users.add('analyst')
+                # bcrypt comparison runs off the event loop; it is constant-
+                # time and authenticate_user equalizes the unknown-user path
+                user = await asyncio.to_thread(
+                    authenticate_user, username.value, password.value)
+                if user is not None:
+                    app.storage.user['token'] = create_access_token(
+                        {'sub': user.username, 'roles': sorted(user.roles)})
                     ui.notify('Login successful', type='positive')
                     ui.navigate.to('/dashboard')
                 else:
                     ui.notify('Invalid credentials', type='negative')
-                    logger.warning(f"Failed login attempt for user: {username.value}")
+                    logger.warning("Failed login attempt for user: %s", username.value)
             
             ui.button('Secure Login', on_click=handle_login).classes('w-full bg-blue-600 text-white')
             
@@ -136,86 +492,43 @@ async def login_page():
                 ui.label('256-bit SSL Encryption • GDPR Compliant')
 
 @ui.page('/dashboard')
+@requires_auth
 async def dashboard():
     """Main fraud detection dashboard"""
     
     # Check authentication
-    if 'analyst' not in authenticated_users:
-        ui.navigate.to('/')
-        return
-    
-    ui.add_head_html('''
-        <style>
-            .dashboard-header {
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                color: white;
-                padding: 1rem;
-                border-radius: 8px;
-                margin-bottom: 1rem;
-            }
-            .metric-card {
-                background: white;
-                border-radius: 8px;
-                padding: 1.5rem;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                border-left: 4px solid #3b82f6;
-            }
-            .alert-card {
-                background: white;
-                border-radius: 8px;
-                padding: 1rem;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                margin-bottom: 0.5rem;
-            }
-            .high-risk { border-left: 4px solid #ef4444; }
-            .medium-risk { border-left: 4px solid #f59e0b; }
-            .low-risk { border-left: 4px solid #10b981; }
-            .status-indicator {
-                display: inline-block;
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-                margin-right: 0.5rem;
-            }
-            .active { background-color: #10b981; }
-            .pending { background-color: #f59e0b; }
-            .resolved { background-color: #6b7280; }
-        </style>
-    ''')
-    
-    # Initialize services if not already done
-    if fraud_service is None:
-        await initialize_services()
     
     # Dashboard header
     with ui.row().classes('dashboard-header w-full'):
         with ui.column():
             ui.html('<h1 style="margin: 0; font-size: 1.5rem;">🛡️ Irish Banking Fraud Detection</h1>')
-            ui.html(f'<p style="margin: 0.5rem 0 0 0; opacity: 0.9;">Real-time monitoring • Last updated: {datetime.now().strftime("%H:%M:%S")}</p>')
+            # Updated by the metrics timer; the shell itself stays static
+            updated_label = ui.html(
+                f'<p style="margin: 0.5rem 0 0 0; opacity: 0.9;">Real-time monitoring • Last updated: {datetime.now().strftime("%H:%M:%S")}</p>')
         ui.spacer()
-        ui.button('Logout', on_click=lambda: (authenticated_users.clear(), ui.navigate.to('/'))).classes('bg-red-500 text-white')
+        ui.button('Logout', on_click=_logout).classes('bg-red-500 text-white')
     
-    # Real-time metrics
+    # Real-time metrics, loaded concurrently with the alert list
+    metrics, active_alerts = await _dashboard_stats()
+    cards = []
     with ui.row().classes('w-full gap-4'):
-        with ui.column().classes('metric-card flex-1'):
-            ui.html('<h3 style="margin: 0; color: #1f2937;">Transactions Today</h3>')
-            ui.html('<p style="margin: 0.5rem 0 0 0; font-size: 2rem; font-weight: bold; color: #3b82f6;">12,847</p>')
-            ui.html('<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">↑ 8.2% from yesterday</p>')
-        
-        with ui.column().classes('metric-card flex-1'):
-            ui.html('<h3 style="margin: 0; color: #1f2937;">Fraud Alerts</h3>')
-            ui.html('<p style="margin: 0.5rem 0 0 0; font-size: 2rem; font-weight: bold; color: #ef4444;">23</p>')
-            ui.html('<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">↓ 12% from yesterday</p>')
-        
-        with ui.column().classes('metric-card flex-1'):
-            ui.html('<h3 style="margin: 0; color: #1f2937;">Risk Score</h3>')
-            ui.html('<p style="margin: 0.5rem 0 0 0; font-size: 2rem; font-weight: bold; color: #f59e0b;">Medium</p>')
-            ui.html('<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">Average: 6.2/10</p>')
-        
-        with ui.column().classes('metric-card flex-1'):
-            ui.html('<h3 style="margin: 0; color: #1f2937;">Blocked Amount</h3>')
-            ui.html('<p style="margin: 0.5rem 0 0 0; font-size: 2rem; font-weight: bold; color: #10b981;">€45,230</p>')
-            ui.html('<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">Prevented today</p>')
+        for title, value, color, footnote in metrics:
+            cards.append(_metric_card(title, value, color, footnote))
+
+    async def _refresh_metrics() -> None:
+        # Push metric deltas over the existing websocket instead of
+        # relying on full page reloads; only cards whose content actually
+        # changed are re-sent by the diff engine
+        new_metrics, _ = await _dashboard_stats()
+        for card, (title, value, color, footnote) in zip(cards, new_metrics):
+            html = _metric_card_html(title, value, color, footnote)
+            if card.content != html:
+                card.content = html
+        updated_label.content = (
+            f'<p style="margin: 0.5rem 0 0 0; opacity: 0.9;">Real-time monitoring • '
+            f'Last updated: {datetime.now().strftime("%H:%M:%S")}</p>')
+
+    ui.timer(5.0, _refresh_metrics)
     
     # Main dashboard content
     with ui.row().classes('w-full gap-4'):
@@ -223,120 +536,28 @@ async def dashboard():
         with ui.column().classes('flex-1'):
             ui.html('<h2 style="margin: 1rem 0 0.5rem 0;">🚨 Active Fraud Alerts</h2>')
             
-            # Sample alerts
-            alerts = [
-                {
-                    'id': 'FA-2024-001',
-                    'customer': 'John O\'Sullivan',
-                    'amount': '€2,500',
-                    'risk': 'high',
-                    'reason': 'Unusual location + High amount',
-                    'time': '2 minutes ago',
-                    'status': 'active'
-                },
-                {
-                    'id': 'FA-2024-002',
-                    'customer': 'Mary Murphy',
-                    'amount': '€850',
-                    'risk': 'medium',
-                    'reason': 'Multiple rapid transactions',
-                    'time': '5 minutes ago',
-                    'status': 'pending'
-                },
-                {
-                    'id': 'FA-2024-003',
-                    'customer': 'Patrick Kelly',
-                    'amount': '€1,200',
-                    'risk': 'low',
-                    'reason': 'New merchant pattern',
-                    'time': '12 minutes ago',
-                    'status': 'resolved'
-                }
-            ]
-            
-            for alert in alerts:
-                with ui.card().classes(f'alert-card {alert["risk"]}-risk'):
-                    with ui.row().classes('w-full items-center'):
-                        ui.html(f'<span class="status-indicator {alert["status"]}"></span>')
-                        with ui.column().classes('flex-1'):
-                            ui.html(f'<strong>{alert["id"]}</strong> - {alert["customer"]}')
-                            ui.html(f'<p style="margin: 0.25rem 0; color: #6b7280;">{alert["reason"]}</p>')
-                            ui.html(f'<small style="color: #9ca3af;">{alert["time"]}</small>')
-                        with ui.column().classes('text-right'):
-                            ui.html(f'<strong style="color: #ef4444;">{alert["amount"]}</strong>')
-                            ui.html(f'<span style="font-size: 0.75rem; color: #6b7280;">{alert["risk"].upper()}</span>')
-                        
-                        if alert['status'] == 'active':
-                            with ui.row().classes('gap-2'):
-                                ui.button('Investigate', size='sm').classes('bg-blue-500 text-white')
-                                ui.button('Block', size='sm').classes('bg-red-500 text-white')
+            for alert in active_alerts:
+                buttons = (_ALERT_BUTTONS_TMPL.format(id=alert['id'])
+                           if alert['status'] == 'active' else '')
+                ui.html(_ALERT_TMPL.format_map(
+                    {**alert, 'risk_upper': alert['risk'].upper(), 'buttons': buttons}))
         
         # Right column - Analytics
         with ui.column().classes('flex-1'):
             ui.html('<h2 style="margin: 1rem 0 0.5rem 0;">📊 Fraud Analytics</h2>')
-            
-            # Transaction volume chart
-            import plotly.graph_objects as go
-            from plotly.subplots import make_subplots
-            
-            # Sample data for demonstration
-            hours = list(range(24))
-            transactions = [120, 95, 80, 65, 45, 30, 25, 40, 85, 150, 200, 250, 280, 290, 275, 260, 240, 220, 200, 180, 160, 140, 130, 125]
-            fraud_detected = [2, 1, 1, 0, 0, 0, 0, 1, 3, 5, 8, 12, 15, 18, 16, 14, 12, 10, 8, 6, 4, 3, 2, 2]
-            
-            fig = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=('Transaction Volume (24h)', 'Fraud Detection Rate'),
-                vertical_spacing=0.1
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=hours, y=transactions, name='Transactions', line=dict(color='#3b82f6')),
-                row=1, col=1
-            )
-            
-            fig.add_trace(
-                go.Bar(x=hours, y=fraud_detected, name='Fraud Alerts', marker_color='#ef4444'),
-                row=2, col=1
-            )
-            
-            fig.update_layout(
-                height=400,
-                showlegend=False,
-                margin=dict(l=0, r=0, t=40, b=0),
-                plot_bgcolor='white'
-            )
-            
-            ui.plotly(fig).classes('w-full')
-            
+
+            # Prebuilt at import; see _build_dashboard_figures
+            ui.plotly(_VOLUME_FIG).classes('w-full')
+
             # Risk distribution
             ui.html('<h3 style="margin: 1rem 0 0.5rem 0;">Risk Distribution</h3>')
-            
-            risk_fig = go.Figure(data=[
-                go.Pie(
-                    labels=['Low Risk', 'Medium Risk', 'High Risk'],
-                    values=[75, 20, 5],
-                    hole=0.4,
-                    marker_colors=['#10b981', '#f59e0b', '#ef4444']
-                )
-            ])
-            
-            risk_fig.update_layout(
-                height=250,
-                margin=dict(l=0, r=0, t=0, b=0),
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5)
-            )
-            
-            ui.plotly(risk_fig).classes('w-full')
+            ui.plotly(_RISK_FIG).classes('w-full')
 
 @ui.page('/transactions')
+@requires_auth
 async def transactions_page():
     """Transaction monitoring and analysis page"""
     
-    if 'analyst' not in authenticated_users:
-        ui.navigate.to('/')
-        return
     
     ui.html('<h1>💳 Transaction Monitoring</h1>')
     
@@ -347,56 +568,40 @@ async def transactions_page():
         ui.select(['Today', 'Last 7 days', 'Last 30 days'], value='Today', label='Time Period').classes('w-48')
         ui.button('Export Report', icon='download').classes('bg-green-500 text-white')
     
-    # Transaction table
-    columns = [
-        {'name': 'transaction_id', 'label': 'Transaction ID', 'field': 'transaction_id', 'sortable': True},
-        {'name': 'customer', 'label': 'Customer', 'field': 'customer', 'sortable': True},
-        {'name': 'amount', 'label': 'Amount', 'field': 'amount', 'sortable': True},
-        {'name': 'merchant', 'label': 'Merchant', 'field': 'merchant', 'sortable': True},
-        {'name': 'risk_score', 'label': 'Risk Score', 'field': 'risk_score', 'sortable': True},
-        {'name': 'status', 'label': 'Status', 'field': 'status', 'sortable': True},
-        {'name': 'timestamp', 'label': 'Time', 'field': 'timestamp', 'sortable': True},
-    ]
-    
-    rows = [
-        {
-            'transaction_id': 'TXN-2024-001234',
-            'customer': 'John O\'Sullivan',
-            'amount': '€2,500.00',
-            'merchant': 'Online Electronics Store',
-            'risk_score': '8.5',
-            'status': 'Flagged',
-            'timestamp': '2024-01-15 14:30:22'
-        },
-        {
-            'transaction_id': 'TXN-2024-001235',
-            'customer': 'Mary Murphy',
-            'amount': '€850.00',
-            'merchant': 'Dublin Restaurant',
-            'risk_score': '6.2',
-            'status': 'Under Review',
-            'timestamp': '2024-01-15 14:25:18'
-        },
-        {
-            'transaction_id': 'TXN-2024-001236',
-            'customer': 'Patrick Kelly',
-            'amount': '€125.50',
-            'merchant': 'Local Grocery Store',
-            'risk_score': '2.1',
-            'status': 'Approved',
-            'timestamp': '2024-01-15 14:20:45'
-        }
-    ]
-    
-    ui.table(columns=columns, rows=rows, row_key='transaction_id').classes('w-full')
+    # Transaction table with server-side pagination: each page request
+    # ships only one page of rows, so render cost stays O(page_size) as
+    # the transactions table grows. Demo rows back an empty database.
+    page_size = 50
+
+    async def _fetch_page(page: int) -> dict:
+        if fraud_service is not None:
+            result = await fraud_service.list_transactions(
+                offset=(page - 1) * page_size, limit=page_size)
+            if result['total']:
+                return result
+        return {'total': len(_DEMO_TRANSACTIONS), 'rows': list(_DEMO_TRANSACTIONS)}
+
+    first_page = await _fetch_page(1)
+    table = ui.table(
+        columns=list(_TRANSACTION_COLUMNS), rows=first_page['rows'],
+        row_key='transaction_id',
+        pagination={'rowsPerPage': page_size, 'rowsNumber': first_page['total'], 'page': 1},
+    ).classes('w-full')
+
+    async def _load_page(e):
+        page = e.args['pagination'].get('page', 1)
+        result = await _fetch_page(page)
+        table.rows = result['rows']
+        table.pagination.update({'page': page, 'rowsNumber': result['total']})
+        table.update()
+
+    table.on('request', _load_page)
 
 @ui.page('/customers')
+@requires_auth
 async def customers_page():
     """Customer risk profiles and management"""
     
-    if 'analyst' not in authenticated_users:
-        ui.navigate.to('/')
-        return
     
     ui.html('<h1>👥 Customer Risk Management</h1>')
     
@@ -407,59 +612,38 @@ async def customers_page():
         ui.button('Add Customer', icon='add').classes('bg-blue-500 text-white')
     
     # Customer cards
-    customers = [
-        {
-            'name': 'John O\'Sullivan',
-            'customer_id': 'CUST-001234',
-            'risk_level': 'High',
-            'risk_score': 8.5,
-            'total_transactions': 1247,
-            'flagged_transactions': 23,
-            'last_activity': '2 hours ago'
-        },
-        {
-            'name': 'Mary Murphy',
-            'customer_id': 'CUST-001235',
-            'risk_level': 'Medium',
-            'risk_score': 5.2,
-            'total_transactions': 892,
-            'flagged_transactions': 8,
-            'last_activity': '1 day ago'
-        }
-    ]
-    
-    for customer in customers:
+    for customer in _DEMO_CUSTOMERS:
         with ui.card().classes('w-full mb-4'):
             with ui.row().classes('w-full items-center'):
-                with ui.column().classes('flex-1'):
-                    ui.html(f'<h3 style="margin: 0;">{customer["name"]}</h3>')
-                    ui.html(f'<p style="margin: 0.25rem 0; color: #6b7280;">ID: {customer["customer_id"]}</p>')
-                    ui.html(f'<p style="margin: 0; color: #6b7280;">Last activity: {customer["last_activity"]}</p>')
-                
-                with ui.column().classes('text-center'):
-                    ui.html(f'<p style="margin: 0; font-size: 0.875rem; color: #6b7280;">Risk Score</p>')
-                    color = '#ef4444' if customer['risk_score'] > 7 else '#f59e0b' if customer['risk_score'] > 4 else '#10b981'
-                    ui.html(f'<p style="margin: 0; font-size: 1.5rem; font-weight: bold; color: {color};">{customer["risk_score"]}</p>')
-                
-                with ui.column().classes('text-center'):
-                    ui.html(f'<p style="margin: 0; font-size: 0.875rem; color: #6b7280;">Transactions</p>')
-                    ui.html(f'<p style="margin: 0; font-weight: bold;">{customer["total_transactions"]}</p>')
-                
-                with ui.column().classes('text-center'):
-                    ui.html(f'<p style="margin: 0; font-size: 0.875rem; color: #6b7280;">Flagged</p>')
-                    ui.html(f'<p style="margin: 0; font-weight: bold; color: #ef4444;">{customer["flagged_transactions"]}</p>')
-                
+                ui.html(
+                    f'<h3 style="margin: 0;">{customer["name"]}</h3>'
+                    f'<p style="margin: 0.25rem 0; color: #6b7280;">ID: {customer["customer_id"]}</p>'
+                    f'<p style="margin: 0; color: #6b7280;">Last activity: {customer["last_activity"]}</p>'
+                ).classes('flex-1')
+
+                color = _risk_color(customer['risk_score'])
+                ui.html(
+                    f'<p style="margin: 0; font-size: 0.875rem; color: #6b7280;">Risk Score</p>'
+                    f'<p style="margin: 0; font-size: 1.5rem; font-weight: bold; color: {color};">{customer["risk_score"]}</p>'
+                ).classes('text-center')
+                ui.html(
+                    f'<p style="margin: 0; font-size: 0.875rem; color: #6b7280;">Transactions</p>'
+                    f'<p style="margin: 0; font-weight: bold;">{customer["total_transactions"]}</p>'
+                ).classes('text-center')
+                ui.html(
+                    f'<p style="margin: 0; font-size: 0.875rem; color: #6b7280;">Flagged</p>'
+                    f'<p style="margin: 0; font-weight: bold; color: #ef4444;">{customer["flagged_transactions"]}</p>'
+                ).classes('text-center')
+
                 with ui.column():
                     ui.button('View Profile', size='sm').classes('bg-blue-500 text-white mb-2')
                     ui.button('Block Account', size='sm').classes('bg-red-500 text-white')
 
 @ui.page('/reports')
+@requires_auth
 async def reports_page():
     """Compliance and regulatory reporting"""
     
-    if 'analyst' not in authenticated_users:
-        ui.navigate.to('/')
-        return
     
     ui.html('<h1>📋 Compliance Reports</h1>')
     
@@ -475,51 +659,40 @@ async def reports_page():
     # Recent reports
     ui.html('<h2>Recent Reports</h2>')
     
-    reports = [
-        {
-            'name': 'Daily Fraud Summary - January 15, 2024',
-            'type': 'Daily Summary',
-            'generated': '2024-01-15 23:59:59',
-            'status': 'Completed',
-            'size': '2.3 MB'
-        },
-        {
-            'name': 'Weekly Analysis - Week 2, 2024',
-            'type': 'Weekly Analysis',
-            'generated': '2024-01-14 18:00:00',
-            'status': 'Completed',
-            'size': '5.7 MB'
-        },
-        {
-            'name': 'Suspicious Activity Report - SAR-2024-003',
-            'type': 'SAR',
-            'generated': '2024-01-13 16:30:00',
-            'status': 'Submitted to Central Bank',
-            'size': '1.8 MB'
-        }
-    ]
-    
-    for report in reports:
+    for report in _DEMO_REPORTS:
         with ui.card().classes('w-full mb-2'):
             with ui.row().classes('w-full items-center'):
-                with ui.column().classes('flex-1'):
-                    ui.html(f'<strong>{report["name"]}</strong>')
-                    ui.html(f'<p style="margin: 0.25rem 0; color: #6b7280;">{report["type"]} • Generated: {report["generated"]}</p>')
-                
-                with ui.column().classes('text-right'):
-                    ui.html(f'<p style="margin: 0; color: #10b981;">{report["status"]}</p>')
-                    ui.html(f'<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">{report["size"]}</p>')
-                
+                ui.html(
+                    f'<strong>{report["name"]}</strong>'
+                    f'<p style="margin: 0.25rem 0; color: #6b7280;">{report["type"]} • Generated: {report["generated"]}</p>'
+                ).classes('flex-1')
+                ui.html(
+                    f'<p style="margin: 0; color: #10b981;">{report["status"]}</p>'
+                    f'<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">{report["size"]}</p>'
+                ).classes('text-right')
+
                 with ui.column():
                     ui.button('Download', icon='download', size='sm').classes('bg-blue-500 text-white')
 
+@app.get('/api/metrics')
+async def api_metrics():
+    """Tiny JSON metrics feed for pollers and external monitors
+
+    External clients poll this instead of re-fetching dashboard HTML;
+    the payload is a few hundred bytes of aggregates per request.
+    """
+    if fraud_service is None:
+        return {'ts': time.time(), 'status': 'initializing'}
+    stats = await fraud_service.get_fraud_statistics(days=1)
+    stats['ts'] = time.time()
+    return stats
+
+
 # Navigation setup
 @ui.page('/nav')
+@requires_auth
 async def setup_navigation():
     """Setup navigation for authenticated users"""
-    if 'analyst' not in authenticated_users:
-        return
-    
     with ui.header().classes('bg-blue-600 text-white'):
         with ui.row().classes('w-full items-center'):
             ui.html('<h1 style="margin: 0;">🛡️ Irish Banking Fraud Detection</h1>')
@@ -529,13 +702,16 @@ async def setup_navigation():
                 ui.link('Transactions', '/transactions').classes('text-white hover:text-blue-200 ml-4')
                 ui.link('Customers', '/customers').classes('text-white hover:text-blue-200 ml-4')
                 ui.link('Reports', '/reports').classes('text-white hover:text-blue-200 ml-4')
-                ui.button('Logout', on_click=lambda: (authenticated_users.clear(), ui.navigate.to('/'))).classes('bg-red-500 text-white ml-4')
+                ui.button('Logout', on_click=_logout).classes('bg-red-500 text-white ml-4')
 
 if __name__ in {"__main__", "__mp_main__"}:
     try:
         # Initialize the application
         logger.info("Starting Irish Banking Fraud Detection System")
-        
+
+        # Warm DB and services before the first request arrives
+        app.on_startup(initialize_services)
+
         # Run the application
         ui.run(
             host=settings.HOST,